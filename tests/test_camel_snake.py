@@ -0,0 +1,36 @@
+"""Tests for the camelCase / snake_case conversions."""
+
+import pytest
+
+from vesselharborcli.core.camel_snake import camel2snake, snake2camel
+
+
+@pytest.mark.parametrize(
+    "snake, start_lower, expected",
+    [
+        ("user_id", False, "UserId"),
+        ("user_id", True, "userId"),
+        ("user_ID", False, "UserId"),
+        ("api_key2", False, "ApiKey2"),
+        ("ab1cd_ef", False, "Ab1CdEf"),
+        ("_private_name", True, "_privateName"),
+        ("trailing_", False, "Trailing_"),
+    ],
+)
+def test_snake2camel(snake, start_lower, expected):
+    """Test snake2camel keeps the str.title() semantics."""
+    assert snake2camel(snake, start_lower) == expected
+
+
+@pytest.mark.parametrize(
+    "camel, expected",
+    [
+        ("UserId", "user_id"),
+        ("userId", "user_id"),
+        ("apiKey2", "api_key_2"),
+        ("HTTPServer", "httpserver"),
+    ],
+)
+def test_camel2snake(camel, expected):
+    """Test camel2snake."""
+    assert camel2snake(camel) == expected
@@ -1,171 +1,128 @@
 """Tests for the VesselHarbor CLI."""
 
-import os
 import sys
-import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
-from typer.testing import CliRunner
+import pytest
 
-from vesselharborcli.cli import app
+from vesselharborcli.__main__ import main
+from vesselharborcli.orgs.organizations import Organization
 
 
-class TestCLI(unittest.TestCase):
-    """Test the CLI commands."""
-
-    def setUp(self):
-        """Set up the test environment."""
-        self.runner = CliRunner()
-
-    @patch("vesselharborcli.auth.TokenManager")
-    def test_login(self, mock_token_manager):
-        """Test the login command."""
-        # Mock the token manager
-        mock_instance = MagicMock()
-        mock_token_manager.return_value = mock_instance
-
-        # Run the command
-        result = self.runner.invoke(
-            app, ["auth", "login"], input="testuser\ntestpassword\n"
-        )
-
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
-
-        # Check that the token manager was called with the correct arguments
-        mock_instance.login_with_password.assert_called_once_with("testuser", "testpassword")
-
-    @patch("vesselharborcli.auth.TokenManager")
-    def test_login_key(self, mock_token_manager):
-        """Test the login-key command."""
-        # Mock the token manager
-        mock_instance = MagicMock()
-        mock_token_manager.return_value = mock_instance
-
-        # Run the command
-        result = self.runner.invoke(
-            app, ["auth", "login-key"], input="testkey\n"
-        )
-
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
-
-        # Check that the token manager was called with the correct arguments
-        mock_instance.login_with_api_key.assert_called_once_with("testkey")
-
-    @patch("vesselharborcli.client.get_client")
-    def test_list_organizations(self, mock_get_client):
-        """Test the list organizations command."""
-        # Mock the client
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
-
-        # Mock the response
-        mock_client.list_organizations.return_value = [
-            MagicMock(id=1, name="Org 1", description="Description 1"),
-            MagicMock(id=2, name="Org 2", description="Description 2"),
-        ]
-
-        # Run the command
-        result = self.runner.invoke(app, ["org", "list"])
-
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
+@pytest.fixture
+def run_cli(monkeypatch):
+    """Run the command line entry point with the given arguments and return its exit code."""
+    def run(*params):
+        monkeypatch.setattr(sys, "argv", ["vesselharborcli", *params])
+        return main()
+    return run
 
-        # Check that the client was called
-        mock_client.list_organizations.assert_called_once()
 
-        # Check that the output contains the organization names
-        self.assertIn("Org 1", result.stdout)
-        self.assertIn("Org 2", result.stdout)
+@pytest.fixture
+def mock_org_api(monkeypatch):
+    """Make the organization API factory return a new mock, recording the configuration it is given."""
+    api = MagicMock()
 
-    @patch("vesselharborcli.client.get_client")
-    def test_create_organization(self, mock_get_client):
-        """Test the create organization command."""
-        # Mock the client
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
+    def get_api(config):
+        api.config = config
+        return api
 
-        # Mock the response
-        mock_client.create_organization.return_value = MagicMock(id=1, name="New Org")
+    monkeypatch.setattr("vesselharborcli.orgs.main.get_APIorg", get_api)
+    return api
 
-        # Run the command
-        result = self.runner.invoke(
-            app, ["org", "create", "--name", "New Org", "--description", "New Description"]
-        )
 
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
+@pytest.fixture
+def mock_token_manager(monkeypatch):
+    """Make the token manager class of the auth commands return a new mock."""
+    token_manager = MagicMock()
+    monkeypatch.setattr("vesselharborcli.auth_commands.TokenManager", lambda *args, **kwargs: token_manager)
+    return token_manager
 
-        # Check that the client was called with the correct arguments
-        mock_client.create_organization.assert_called_once()
-        args, _ = mock_client.create_organization.call_args
-        self.assertEqual(args[0].name, "New Org")
-        self.assertEqual(args[0].description, "New Description")
 
-        # Check that the output contains the success message
-        self.assertIn("Organization created successfully", result.stdout)
-
-    @patch("vesselharborcli.config.get_settings")
-    @patch("os.environ")
-    @patch("json.dump")
-    @patch("builtins.open", new_callable=unittest.mock.mock_open)
-    def test_set_server(self, mock_open, mock_dump, mock_environ, mock_get_settings):
-        """Test the set-server command."""
-        # Mock the settings
-        mock_settings = MagicMock()
-        mock_settings.server_name = "localhost"
-        mock_settings.server_port = 8000
-        mock_get_settings.return_value = mock_settings
-
-        # Run the command
-        result = self.runner.invoke(app, ["config", "set-server", "api.example.com"])
-
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
-
-        # Check that the environment variable was set
-        mock_environ.__setitem__.assert_called_with("VESSELHARBOR_SERVER_NAME", "api.example.com")
-
-        # Check that the settings were updated
-        self.assertEqual(mock_settings.server_name, "api.example.com")
-
-        # Check that the api_url was reconstructed
-        self.assertEqual(mock_settings.api_url, f"http://{mock_settings.server_name}:{mock_settings.server_port}")
-
-        # Check that the output contains the success message
-        self.assertIn("Server name set to: api.example.com", result.stdout)
-
-    @patch("vesselharborcli.config.get_settings")
-    @patch("os.environ")
-    @patch("json.dump")
-    @patch("builtins.open", new_callable=unittest.mock.mock_open)
-    def test_set_port(self, mock_open, mock_dump, mock_environ, mock_get_settings):
-        """Test the set-port command."""
-        # Mock the settings
-        mock_settings = MagicMock()
-        mock_settings.server_name = "localhost"
-        mock_settings.server_port = 8000
-        mock_get_settings.return_value = mock_settings
-
-        # Run the command
-        result = self.runner.invoke(app, ["config", "set-port", "8080"])
-
-        # Check that the command was successful
-        self.assertEqual(result.exit_code, 0)
-
-        # Check that the environment variable was set
-        mock_environ.__setitem__.assert_called_with("VESSELHARBOR_SERVER_PORT", "8080")
-
-        # Check that the settings were updated
-        self.assertEqual(mock_settings.server_port, 8080)
+def test_version(run_cli, capsys):
+    """Test the version option."""
+    assert run_cli("-v") == 0
+    assert "version" in capsys.readouterr().out
 
-        # Check that the api_url was reconstructed
-        self.assertEqual(mock_settings.api_url, f"http://{mock_settings.server_name}:{mock_settings.server_port}")
 
-        # Check that the output contains the success message
-        self.assertIn("Server port set to: 8080", result.stdout)
+def test_list_organizations(run_cli, mock_org_api, capsys):
+    """Test the list organizations command."""
+    # Mock the response
+    mock_org_api.iter_organizations.return_value = iter([
+        Organization(id=1, name="Org 1", description="Description 1"),
+        Organization(id=2, name="Org 2", description="Description 2"),
+    ])
 
+    # Run the command
+    assert run_cli("org", "list") == 0
 
-if __name__ == "__main__":
-    unittest.main()
+    # Check that the rows are printed as they are iterated
+    mock_org_api.iter_organizations.assert_called_once_with()
+    out = capsys.readouterr().out
+    assert "  1: Org 1" in out
+    assert "  2: Org 2" in out
+    assert "Total: 2" in out
+
+
+def test_create_organization(run_cli, mock_org_api, capsys):
+    """Test the create organization command."""
+    # Mock the response
+    mock_org_api.create_organization.return_value = Organization(id=1, name="New Org")
+
+    # Run the command
+    assert run_cli("org", "create", "--name", "New Org", "--description", "New Description") == 0
+
+    # Check that the API was called with the correct arguments
+    mock_org_api.create_organization.assert_called_once()
+    args, _ = mock_org_api.create_organization.call_args
+    assert args[0].name == "New Org"
+    assert args[0].description == "New Description"
+
+    # Check that the output contains the success message
+    assert "Organization created successfully" in capsys.readouterr().out
+
+
+def test_delete_organization(run_cli, mock_org_api, capsys):
+    """Test the delete organization command."""
+    assert run_cli("org", "delete", "3") == 0
+    mock_org_api.delete_organization.assert_called_once_with(3)
+    assert "Organization 3 deleted successfully" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "params, env, expected",
+    [
+        (["-p", "8080"], {}, "8080"),
+        ([], {"VESSELHARBOR_PORT": "9090"}, "9090"),
+    ],
+    ids=["option", "environment"],
+)
+def test_port_setting(run_cli, mock_org_api, monkeypatch, params, env, expected):
+    """Test the port is read from the command line option or from the environment."""
+    monkeypatch.delenv("VESSELHARBOR_PORT", raising=False)
+    for variable, value in env.items():
+        monkeypatch.setenv(variable, value)
+    mock_org_api.iter_organizations.return_value = iter([])
+
+    assert run_cli(*params, "org", "list") == 0
+    assert str(mock_org_api.config["application.port"]) == expected
+
+
+def test_token_auth(run_cli, mock_token_manager, capsys):
+    """Test the test_token_auth command."""
+    mock_token_manager.login_with_api_key.return_value = True
+    mock_token_manager.access_token = "access-token-value"
+    mock_token_manager.expires_at = None
+    mock_token_manager.refresh_token = None
+
+    assert run_cli("auth", "test_token_auth") == 0
+    mock_token_manager.login_with_api_key.assert_called_once_with()
+    assert "Token authentication successful!" in capsys.readouterr().out
+
+
+def test_token_auth_failure(run_cli, mock_token_manager, capsys):
+    """Test the test_token_auth command when no token is received."""
+    mock_token_manager.login_with_api_key.return_value = False
+
+    assert run_cli("auth", "test_token_auth") == 1
+    assert "no token received" in capsys.readouterr().err
@@ -1,25 +1,23 @@
 import sys
 import argparse
+import importlib
 
 from os.path import basename
+from types import MappingProxyType
 
 from .service import svc_store
 from .core.arg_params import arg_parser
-from .core.config import create_config
 from .version import __software__, __description__, __version__
-from .orgs.main import orgs_services
-from .environments.main import environments_services
-from .users.main import users_services
-from .auth_commands import auth_services
-from .interactive_service import interactive_services
 
 
 __SOFTWARE__ = __software__.upper()
+__ENV_PREFIX__ = __SOFTWARE__ + '_'
 
 # default configuration attribute stored in configuration file (useful for command line program)
 # internal items are not stored but are used internally
 # you may use <> to define repetitive items
-default_config = {
+# module level tables are read only: services merge them into new dictionaries
+default_config = MappingProxyType({
     'application': {
         'verbose': False,
         'ip_address': '127.0.0.1',
@@ -33,21 +31,33 @@ default_config = {
         'development': False,
         'debug': False,
     },
-}
+})
 
 # each long name option has to be defined into basic_options
-params_link = { # configuration attribute  [ long name option, Environment attribute , .env attribute]
-    'internal.debug': ['debug_do_not_use', __SOFTWARE__ + '_DEBUG', 'DEBUG'],
-    'internal.simulate': ['simulate_do_not_use', __SOFTWARE__ + '_SIMULATE', 'SIMULATE'],
-    'internal.development': ['development_do_not_use', __SOFTWARE__ + '_DEVEL', 'DEVELOPMENT'],
-    'internal.noauth': ['noauth_do_not_use', __SOFTWARE__ + '_DEVEL', 'NOAUTH'],
-    'internal.demo': ['demo', __SOFTWARE__ + '_DEMO', 'DEMO'],
-    'application.verbose': ['verbose', __SOFTWARE__ + '_VERBOSE', 'VERBOSE'],
-    'application.ip_address': ['ip_address[0]', __SOFTWARE__ + '_IP_ADDRESS', 'IP_ADDRESS'],
-    'application.port': ['port[0]', __SOFTWARE__ + '_PORT', 'PORT'],
-    'application.socket': ['socket[0]', __SOFTWARE__ + '_SOCKET', 'SOCKET'],
+params_link = MappingProxyType({ # configuration attribute  ( long name option, Environment attribute , .env attribute)
+    'internal.debug': ('debug_do_not_use', __ENV_PREFIX__ + 'DEBUG', 'DEBUG'),
+    'internal.simulate': ('simulate_do_not_use', __ENV_PREFIX__ + 'SIMULATE', 'SIMULATE'),
+    'internal.development': ('development_do_not_use', __ENV_PREFIX__ + 'DEVEL', 'DEVELOPMENT'),
+    'internal.noauth': ('noauth_do_not_use', __ENV_PREFIX__ + 'DEVEL', 'NOAUTH'),
+    'internal.demo': ('demo', __ENV_PREFIX__ + 'DEMO', 'DEMO'),
+    'application.verbose': ('verbose', __ENV_PREFIX__ + 'VERBOSE', 'VERBOSE'),
+    'application.ip_address': ('ip_address[0]', __ENV_PREFIX__ + 'IP_ADDRESS', 'IP_ADDRESS'),
+    'application.port': ('port[0]', __ENV_PREFIX__ + 'PORT', 'PORT'),
+    'application.socket': ('socket[0]', __ENV_PREFIX__ + 'SOCKET', 'SOCKET'),
+})
+
+# command group name -> [module, service class], services are only imported when needed
+services_link = {
+    'org': ['.orgs.main', 'orgs_services'],
+    'environment': ['.environments.main', 'environments_services'],
+    'user': ['.users.main', 'users_services'],
+    'auth': ['.auth_commands', 'auth_services'],
+    'interactive': ['.interactive_service', 'interactive_services'],
 }
 
+# basic options expecting a value: the token following them is not a command group
+value_options = ['-C', '--conf', '-W', '--write-conf', '-A', '--ip-address', '-p', '--port', '-S', '--socket']
+
 params_link_app = None
 default_config_app = None
 args = None
@@ -67,6 +77,47 @@ def basic_options(parser):
     parser.add_argument('--development_do_not_use', help=argparse.SUPPRESS, action='store_true')
 
 
+def load_service(name):
+    """
+    Import the module of a command group and instantiate its service.
+
+    :param name: Name of the command group as registered in `services_link`.
+    :type name: str
+
+    :return: The service instance handling the command group.
+    :rtype: svc_class
+    """
+    module, service = services_link[name]
+    return getattr(importlib.import_module(module, __package__), service)()
+
+
+def split_params(params):
+    """
+    Split the command line between basic options and command group without parsing it.
+
+    Basic options are collected up to the first positional argument, which is the
+    command group. Values of the options expecting one are skipped.
+
+    :param params: Command-line arguments, without the program name.
+    :type params: list of str
+
+    :return: The basic options given and the command group (None if there is none).
+    :rtype: tuple(list of str, str or None)
+    """
+    options = []
+    skip = False
+    for param in params:
+        if skip:
+            skip = False
+        elif param in value_options:
+            skip = True
+        elif param.startswith('-'):
+            options.append(param)
+        else:
+            return options, param
+    return options, None
+
+
 def main():
     """
     Main function of the application.
@@ -83,8 +134,20 @@ def main():
     """
 
     Params = sys.argv
-    # Create the store with organizations, environments, users, authentication and interactive services
-    apps_store = svc_store([orgs_services(), environments_services(), users_services(), auth_services(), interactive_services()])
+    # The arguments without the program name, sliced once for the splitting and the parsing
+    params = Params[1:]
+    options, command = split_params(params)
+    # Answer a version request before loading any command group
+    if '-v' in options or '--version' in options:
+        print(__software__ + " version : " + __version__)
+        return 0
+
+    # Only build the parser of the requested command group, or of every one of them when it
+    # can not be guessed or when the general help is requested
+    if command in services_link and '-h' not in options and '--help' not in options:
+        apps_store = svc_store([load_service(command)])
+    else:
+        apps_store = svc_store([load_service(name) for name in services_link])
     app_name = basename(Params[0])
 
     # Detect the application based on the program name
@@ -117,37 +180,35 @@ def main():
     )
 
     # Parse the arguments
-    args = parser.parse_args(Params)
-
-    config = create_config(args.conf, args, params_link_app, default_config_app, args.debug_do_not_use)
+    args = parser.parse_args(params, skip=0)
 
     if args.version == True:
         parser.print_version()
-        exit(0)
+        sys.exit(0)
 
     # Dispatch to the appropriate service
-    run_app = None
-    for service in apps_store.svcs:
-        if service.cmd_name(args.mode):
-            run_app= service
-            break
+    run_app = apps_store.selected_cmd(args.mode)
     # if no service match, raise an error
     if run_app is None:
         print(f"Error: Unknown commands group '{args.mode}'", file=sys.stderr)
         parser.print_help()
         return 1
 
+    # Configuration is only read once a command has to be run
+    from .core.config import create_config
+    config = create_config(args.conf, args, params_link_app, default_config_app, args.debug_do_not_use)
+
     if args.write == True:
         config.writeto("./myeasyserver.toml", False)
         print("Configuration file is written to ./myeasyserver.toml. Exiting.")
-        exit(0)
+        sys.exit(0)
     if args.write_conf is not None:
         config.writeto(args.write_conf[0], False)
         print("Configuration file is written to %s. Exiting." % args.write_conf[0])
-        exit(0)
+        sys.exit(0)
 
     return run_app.run()
 
 if __name__ == "__main__":
     ret = main()
-    exit(ret)
+    sys.exit(ret)
@@ -12,7 +12,7 @@
 #
 
 import sys
-import requests
+import time
 from .core.auth import TokenManager, AuthenticationError
 from .service import svc_class
 from .version import __software__
@@ -47,12 +47,8 @@ class auth_services(svc_class):
         token_auth_parser.set_defaults(func='test_token_auth')
 
     @staticmethod
-    def test_name(name):
-        return name == __software__ + 'auth'
-
-    @staticmethod
-    def cmd_name(name):
-        return name == 'auth'
+    def prog_name():
+        return __software__ + 'auth'
 
     def run(self) -> int:
 
@@ -84,21 +80,22 @@ class auth_services(svc_class):
                 token_manager = TokenManager()
 
                 # Check if API key is configured
-                if not config.config['application.api_key']:
+                if not config['application.api_key']:
                     print("Error: API key not configured.", file=sys.stderr)
                     print("Please set it in your configuration file or environment variables.", file=sys.stderr)
                     return 1
 
                 try:
                     # Attempt to login with API key
-                    token_response = token_manager.login_with_api_key()
+                    if not token_manager.login_with_api_key() or not token_manager.access_token:
+                        print("Token authentication failed: no token received", file=sys.stderr)
+                        return 1
                     print("Token authentication successful!")
-                    print(f"Token type: {token_response.token_type}")
-                    print(f"Access token: {token_response.access_token[:10]}... (truncated)")
-                    if token_response.expires_in:
-                        print(f"Expires in: {token_response.expires_in} seconds")
-                    if token_response.refresh_token:
-                        print(f"Refresh token: {token_response.refresh_token[:10]}... (truncated)")
+                    print(f"Access token: {token_manager.access_token[:10]}... (truncated)")
+                    if token_manager.expires_at:
+                        print(f"Expires in: {int(token_manager.expires_at - time.time())} seconds")
+                    if token_manager.refresh_token:
+                        print(f"Refresh token: {token_manager.refresh_token[:10]}... (truncated)")
                     return 0
                 except AuthenticationError as e:
                     print(f"Token authentication failed: {str(e)}", file=sys.stderr)
@@ -5,17 +5,39 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Iterable, NamedTuple, Tuple
 
-from rich.console import Console
-from rich.table import Table
+try:
+    from orjson import OPT_INDENT_2, dumps as _orjson_dumps, loads as json_loads
+
+    def json_dumps(data) -> bytes:
+        """Serialize the data to indented JSON."""
+        return _orjson_dumps(data, option=OPT_INDENT_2)
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps(data) -> bytes:
+        """Serialize the data to indented JSON."""
+        return json.dumps(data, indent=2).encode()
 
-from vesselharborcli.auth import TokenManager, AuthenticationError
-from vesselharborcli.client import get_client, APIError, OrganizationCreate, OrganizationUpdate
 from vesselharborcli.config import get_settings
 
-# Create console for rich output
-console = Console()
+# Console for rich output, created on first use
+_console = None
+
+# Highest-priority configuration location, computed once
+CONFIG_DIR = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "vesselharbor"
+CONFIG_FILE = CONFIG_DIR / "config.json"
+
+def get_console():
+    """Return the console for rich output, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
 
 # Create the main parser
 parser = argparse.ArgumentParser(
@@ -27,6 +49,16 @@ parser = argparse.ArgumentParser(
 parser.add_argument("--server", "-s", help="Override server name for this session")
 parser.add_argument("--port", "-p", type=int, help="Override server port for this session")
 
+# Help of the command groups, shown in the main help
+GROUP_HELP = {
+    "auth": "Authentication commands",
+    "org": "Organization commands",
+    "config": "Configuration commands",
+}
+
+# Global options expecting a value, needed to find the command before parsing
+value_options = ("--server", "-s", "--port", "-p")
+
 # Create subparsers for commands
 subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 subparsers.required = True
@@ -35,395 +67,435 @@ subparsers.required = True
 command_functions: Dict[str, Callable] = {}
 
 
-# Authentication commands
-auth_parser = subparsers.add_parser("auth", help="Authentication commands")
-auth_subparsers = auth_parser.add_subparsers(dest="auth_command", help="Auth command to execute")
-auth_subparsers.required = True
+def selected_command(group: str, command: Optional[str]) -> Optional[str]:
+    """Return the command of the group to build, None when every command of the group is needed."""
+    return command if command in DISPATCH[group] else None
 
-# Login command
-login_parser = auth_subparsers.add_parser("login", help="Login with username and password")
-login_parser.add_argument("--username", help="Username", required=True)
-login_parser.add_argument("--password", help="Password", required=True)
 
+# Authentication commands
 def login(args):
     """Login with username and password."""
+    from vesselharborcli.auth import TokenManager, AuthenticationError
+
     try:
         token_manager = TokenManager(server=args.server, port=args.port)
         token_response = token_manager.login_with_password
-        console.print(f"[green]Successfully logged in as {args.username}[/green]")
+        get_console().print(f"[green]Successfully logged in as {args.username}[/green]")
     except AuthenticationError as e:
-        console.print(f"[red]Authentication failed: {str(e)}[/red]")
+        get_console().print(f"[red]Authentication failed: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["auth_login"] = login
 
-# Login with API key command
-login_key_parser = auth_subparsers.add_parser("login-key", help="Login with API key")
-login_key_parser.add_argument("--api-key", help="API Key", required=True)
 
 def login_key(args):
     """Login with API key."""
+    from vesselharborcli.auth import TokenManager, AuthenticationError
+
     try:
         token_manager = TokenManager(server=args.server, port=args.port)
         token_response = token_manager.login_with_api_key(args.api_key)
-        console.print(f"[green]Successfully logged in with API key[/green]")
+        get_console().print(f"[green]Successfully logged in with API key[/green]")
     except AuthenticationError as e:
-        console.print(f"[red]Authentication failed: {str(e)}[/red]")
+        get_console().print(f"[red]Authentication failed: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["auth_login-key"] = login_key
 
-# Logout command
-logout_parser = auth_subparsers.add_parser("logout", help="Logout and clear tokens")
 
 def logout(args):
     """Logout and clear tokens."""
+    from vesselharborcli.auth import TokenManager
+
     try:
         token_manager = TokenManager(server=args.server, port=args.port)
         token_manager.logout()
-        console.print("[green]Successfully logged out[/green]")
+        get_console().print("[green]Successfully logged out[/green]")
     except Exception as e:
-        console.print(f"[red]Logout failed: {str(e)}[/red]")
+        get_console().print(f"[red]Logout failed: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["auth_logout"] = logout
 
-# Auth status command
-auth_status_parser = auth_subparsers.add_parser("status", help="Check authentication status")
 
 def auth_status(args):
     """Check authentication status."""
+    from vesselharborcli.auth import TokenManager
+
     token_manager = TokenManager(server=args.server, port=args.port)
     if token_manager.settings.auth.token:
-        console.print("[green]Authenticated with token[/green]")
+        get_console().print("[green]Authenticated with token[/green]")
     elif token_manager.settings.auth.api_key:
-        console.print("[green]Authenticated with API key[/green]")
+        get_console().print("[green]Authenticated with API key[/green]")
     else:
-        console.print("[yellow]Not authenticated[/yellow]")
+        get_console().print("[yellow]Not authenticated[/yellow]")
 
 command_functions["auth_status"] = auth_status
 
 
+def _build_auth(subparsers, command=None):
+    """Add the authentication commands to the parser."""
+    auth_parser = subparsers.add_parser("auth", help=GROUP_HELP["auth"])
+    auth_subparsers = auth_parser.add_subparsers(dest="auth_command", help="Auth command to execute")
+    auth_subparsers.required = True
+    command = selected_command("auth", command)
+
+    # Login command
+    if command in (None, "login"):
+        login_parser = auth_subparsers.add_parser("login", help="Login with username and password")
+        login_parser.add_argument("--username", help="Username", required=True)
+        login_parser.add_argument("--password", help="Password", required=True)
+
+    # Login with API key command
+    if command in (None, "login-key"):
+        login_key_parser = auth_subparsers.add_parser("login-key", help="Login with API key")
+        login_key_parser.add_argument("--api-key", help="API Key", required=True)
+
+    # Logout command
+    if command in (None, "logout"):
+        auth_subparsers.add_parser("logout", help="Logout and clear tokens")
+
+    # Auth status command
+    if command in (None, "status"):
+        auth_subparsers.add_parser("status", help="Check authentication status")
+
+
 # Organization commands
-org_parser = subparsers.add_parser("org", help="Organization commands")
-org_subparsers = org_parser.add_subparsers(dest="org_command", help="Organization command to execute")
-org_subparsers.required = True
+def emit_table(title: str, columns: List[Tuple[str, Optional[str]]], rows: Iterable[Tuple[str, ...]]):
+    """Print the rows as a table, as tab separated lines when the output is not a terminal."""
+    if not sys.stdout.isatty() or os.environ.get("VESSELHARBOR_PLAIN"):
+        sys.stdout.write("\t".join(name for name, _ in columns) + "\n")
+        sys.stdout.writelines("\t".join(row) + "\n" for row in rows)
+        return
+
+    from rich.table import Table
+
+    table = Table(title=title)
+    for name, style in columns:
+        table.add_column(name, style=style)
+    for row in rows:
+        table.add_row(*row)
+    get_console().print(table)
 
-# List organizations command
-list_org_parser = org_subparsers.add_parser("list", help="List organizations")
 
 def list_organizations(args):
     """List organizations."""
+    from vesselharborcli.client import get_client, APIError
+
     try:
         client = get_client(server=args.server, port=args.port)
         organizations = client.list_organizations()
 
         if not organizations:
-            console.print("[yellow]No organizations found[/yellow]")
+            get_console().print("[yellow]No organizations found[/yellow]")
             return
 
-        table = Table(title="Organizations")
-        table.add_column("ID", style="dim")
-        table.add_column("Name", style="green")
-        table.add_column("Description")
-
-        for org in organizations:
-            table.add_row(
-                str(org.id),
-                org.name,
-                org.description or ""
-            )
-
-        console.print(table)
+        emit_table(
+            "Organizations",
+            [("ID", "dim"), ("Name", "green"), ("Description", None)],
+            ((str(org.id), org.name, org.description or "") for org in organizations)
+        )
     except APIError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["org_list"] = list_organizations
 
-# Get organization command
-get_org_parser = org_subparsers.add_parser("get", help="Get organization details")
-get_org_parser.add_argument("org_id", type=int, help="Organization ID")
 
 def get_organization(args):
     """Get organization details."""
+    from vesselharborcli.client import get_client, APIError
+
     try:
         client = get_client(server=args.server, port=args.port)
         org = client.get_organization(args.org_id)
 
-        table = Table(title=f"Organization: {org.name}")
-        table.add_column("Field", style="blue")
-        table.add_column("Value")
-
-        table.add_row("ID", str(org.id))
-        table.add_row("Name", org.name)
-        table.add_row("Description", org.description or "")
-
-        console.print(table)
+        emit_table(
+            f"Organization: {org.name}",
+            [("Field", "blue"), ("Value", None)],
+            [("ID", str(org.id)), ("Name", org.name), ("Description", org.description or "")]
+        )
     except APIError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["org_get"] = get_organization
 
-# Create organization command
-create_org_parser = org_subparsers.add_parser("create", help="Create a new organization")
-create_org_parser.add_argument("--name", required=True, help="Organization name")
-create_org_parser.add_argument("--description", help="Organization description")
 
 def create_organization(args):
     """Create a new organization."""
+    from vesselharborcli.client import get_client, APIError, OrganizationCreate
+
     try:
         client = get_client(server=args.server, port=args.port)
         org_data = OrganizationCreate(name=args.name, description=args.description)
         org = client.create_organization(org_data)
 
-        console.print(f"[green]Organization created successfully with ID: {org.id}[/green]")
+        get_console().print(f"[green]Organization created successfully with ID: {org.id}[/green]")
     except APIError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["org_create"] = create_organization
 
-# Update organization command
-update_org_parser = org_subparsers.add_parser("update", help="Update an organization")
-update_org_parser.add_argument("org_id", type=int, help="Organization ID")
-update_org_parser.add_argument("--name", help="New organization name")
-update_org_parser.add_argument("--description", help="New organization description")
 
 def update_organization(args):
     """Update an organization."""
+    from vesselharborcli.client import get_client, APIError, OrganizationUpdate
+
     try:
-        # First get the current organization to use as defaults
+        # Only the provided fields are sent, the others are left unchanged by the server
         client = get_client(server=args.server, port=args.port)
-        current_org = client.get_organization(args.org_id)
-
-        # Use provided values or current values as defaults
-        update_name = args.name if args.name is not None else current_org.name
-        update_description = args.description if args.description is not None else current_org.description
-
-        # Update the organization
-        org_data = OrganizationUpdate(name=update_name, description=update_description)
+        org_data = OrganizationUpdate(name=args.name, description=args.description)
         org = client.update_organization(args.org_id, org_data)
 
-        console.print(f"[green]Organization updated successfully: {org.name}[/green]")
+        get_console().print(f"[green]Organization updated successfully: {org.name}[/green]")
     except APIError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["org_update"] = update_organization
 
-# Delete organization command
-delete_org_parser = org_subparsers.add_parser("delete", help="Delete an organization")
-delete_org_parser.add_argument("org_id", type=int, help="Organization ID")
-delete_org_parser.add_argument("--yes", "-y", action="store_true", help="Skip confirmation prompt")
 
 def delete_organization(args):
     """Delete an organization."""
+    from vesselharborcli.client import get_client, APIError
+
     try:
         if not args.yes:
-            # Use input() instead of typer.confirm
-            response = input(f"Are you sure you want to delete organization with ID {args.org_id}? (y/n): ")
-            if response.lower() not in ["y", "yes"]:
-                console.print("[yellow]Operation cancelled[/yellow]")
+            # Read the answer straight from stdin, an empty answer or the end of input cancels
+            sys.stdout.write(f"Are you sure you want to delete organization with ID {args.org_id}? (y/n): ")
+            sys.stdout.flush()
+            response = sys.stdin.readline().strip().lower()
+            if response not in ("y", "yes"):
+                get_console().print("[yellow]Operation cancelled[/yellow]")
                 return
 
         client = get_client(server=args.server, port=args.port)
         client.delete_organization(args.org_id)
 
-        console.print(f"[green]Organization with ID {args.org_id} deleted successfully[/green]")
+        get_console().print(f"[green]Organization with ID {args.org_id} deleted successfully[/green]")
     except APIError as e:
-        console.print(f"[red]Error: {str(e)}[/red]")
+        get_console().print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
 command_functions["org_delete"] = delete_organization
 
 
-# Config commands
-config_parser = subparsers.add_parser("config", help="Configuration commands")
-config_subparsers = config_parser.add_subparsers(dest="config_command", help="Config command to execute")
-config_subparsers.required = True
-
-# Set API URL command
-set_url_parser = config_subparsers.add_parser("set-url", help="Set the API URL")
-set_url_parser.add_argument("url", help="API URL")
-
-def set_api_url(args):
-    """Set the API URL."""
-    settings = get_settings()
-
-    # Update environment variable
-    os.environ["VESSELHARBOR_API_URL"] = args.url
-
-    # Also update the settings object
-    settings.api_url = args.url
-
-    # Save the configuration to the highest-priority location
-    config_dir = Path.home() / ".config" / "vesselharbor"
-    config_file = config_dir / "config.json"
+def _build_org(subparsers, command=None):
+    """Add the organization commands to the parser."""
+    org_parser = subparsers.add_parser("org", help=GROUP_HELP["org"])
+    org_subparsers = org_parser.add_subparsers(dest="org_command", help="Organization command to execute")
+    org_subparsers.required = True
+    command = selected_command("org", command)
 
-    # Create directory if it doesn't exist
-    os.makedirs(config_dir, exist_ok=True)
-
-    # Load existing config or create a new one
-    config_data = {}
-    if config_file.exists():
-        try:
-            with open(config_file, "r") as f:
-                config_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
+    # List organizations command
+    if command in (None, "list"):
+        org_subparsers.add_parser("list", help="List organizations")
 
-    # Update config with new API URL
-    config_data["api_url"] = args.url
+    # Get organization command
+    if command in (None, "get"):
+        get_org_parser = org_subparsers.add_parser("get", help="Get organization details")
+        get_org_parser.add_argument("org_id", type=int, help="Organization ID")
 
-    # Save config
-    with open(config_file, "w") as f:
-        json.dump(config_data, f, indent=2)
+    # Create organization command
+    if command in (None, "create"):
+        create_org_parser = org_subparsers.add_parser("create", help="Create a new organization")
+        create_org_parser.add_argument("--name", required=True, help="Organization name")
+        create_org_parser.add_argument("--description", help="Organization description")
 
-    console.print(f"[green]API URL set to: {args.url}[/green]")
+    # Update organization command
+    if command in (None, "update"):
+        update_org_parser = org_subparsers.add_parser("update", help="Update an organization")
+        update_org_parser.add_argument("org_id", type=int, help="Organization ID")
+        update_org_parser.add_argument("--name", help="New organization name")
+        update_org_parser.add_argument("--description", help="New organization description")
 
-command_functions["config_set-url"] = set_api_url
+    # Delete organization command
+    if command in (None, "delete"):
+        delete_org_parser = org_subparsers.add_parser("delete", help="Delete an organization")
+        delete_org_parser.add_argument("org_id", type=int, help="Organization ID")
+        delete_org_parser.add_argument("--yes", "-y", action="store_true", help="Skip confirmation prompt")
 
-# Set server name command
-set_server_parser = config_subparsers.add_parser("set-server", help="Set the server name or IP address")
-set_server_parser.add_argument("server_name", help="Server name or IP address")
-
-def set_server_name(args):
-    """Set the server name or IP address."""
-    settings = get_settings()
-
-    # Update environment variable
-    os.environ["VESSELHARBOR_SERVER_NAME"] = args.server_name
-
-    # Also update the settings object
-    settings.server_name = args.server_name
-    settings.api_url = f"http://{settings.server_name}:{settings.server_port}"
-
-    # Save the configuration to the highest-priority location
-    config_dir = Path.home() / ".config" / "vesselharbor"
-    config_file = config_dir / "config.json"
 
+# Config commands
+def update_config(**fields):
+    """Merge the fields into the saved configuration, replacing the file atomically."""
     # Create directory if it doesn't exist
-    os.makedirs(config_dir, exist_ok=True)
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
     # Load existing config or create a new one
-    config_data = {}
-    if config_file.exists():
-        try:
-            with open(config_file, "r") as f:
-                config_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
+    try:
+        config_data = json_loads(CONFIG_FILE.read_bytes())
+    except (json.JSONDecodeError, IOError):
+        config_data = {}
+    config_data.update(fields)
+
+    # Save config through a temporary file so that a failed write keeps the previous one
+    tmp_file = CONFIG_FILE.with_suffix(".tmp")
+    tmp_file.write_bytes(json_dumps(config_data))
+    os.replace(tmp_file, CONFIG_FILE)
+
+
+class ConfigField(NamedTuple):
+    """Setting handled by the set-<command> and get-<command> configuration commands."""
+
+    command: str
+    attribute: str
+    variable: str
+    argument: str
+    argument_type: Optional[Callable]
+    argument_help: str
+    label: str
+    set_help: str
+    get_help: str
+
+
+CONFIG_FIELDS = (
+    ConfigField("url", "api_url", "VESSELHARBOR_API_URL", "url", None, "API URL", "API URL",
+                "Set the API URL", "Get the current API URL"),
+    ConfigField("server", "server_name", "VESSELHARBOR_SERVER_NAME", "server_name", None,
+                "Server name or IP address", "Server name",
+                "Set the server name or IP address", "Get the current server name"),
+    ConfigField("port", "server_port", "VESSELHARBOR_SERVER_PORT", "port_value", int, "Server port", "Server port",
+                "Set the server port", "Get the current server port"),
+)
 
-    # Update config with new server name
-    config_data["server_name"] = args.server_name
-    config_data["api_url"] = settings.api_url
 
-    # Save config
-    with open(config_file, "w") as f:
-        json.dump(config_data, f, indent=2)
+def make_setter(field: ConfigField) -> Callable:
+    """Return the command function saving the setting, the server settings also update the API URL."""
+    def setter(args):
+        value = getattr(args, field.argument)
+        settings = get_settings()
 
-    console.print(f"[green]Server name set to: {args.server_name}[/green]")
-    console.print(f"[green]API URL updated to: {settings.api_url}[/green]")
+        # Update environment variable
+        os.environ[field.variable] = str(value)
 
-command_functions["config_set-server"] = set_server_name
+        # Also update the settings object
+        setattr(settings, field.attribute, value)
+        fields = {field.attribute: value}
+        if field.attribute != "api_url":
+            settings.api_url = f"http://{settings.server_name}:{settings.server_port}"
+            fields["api_url"] = settings.api_url
 
-# Set server port command
-set_port_parser = config_subparsers.add_parser("set-port", help="Set the server port")
-set_port_parser.add_argument("port_value", type=int, help="Server port")
+        # Save the configuration to the highest-priority location
+        update_config(**fields)
 
-def set_server_port(args):
-    """Set the server port."""
-    settings = get_settings()
+        get_console().print(f"[green]{field.label} set to: {value}[/green]")
+        if field.attribute != "api_url":
+            get_console().print(f"[green]API URL updated to: {settings.api_url}[/green]")
 
-    # Update environment variable
-    os.environ["VESSELHARBOR_SERVER_PORT"] = str(args.port_value)
+    setter.__doc__ = field.set_help + "."
+    return setter
 
-    # Also update the settings object
-    settings.server_port = args.port_value
-    settings.api_url = f"http://{settings.server_name}:{settings.server_port}"
 
-    # Save the configuration to the highest-priority location
-    config_dir = Path.home() / ".config" / "vesselharbor"
-    config_file = config_dir / "config.json"
+def make_getter(field: ConfigField) -> Callable:
+    """Return the command function printing the setting."""
+    def getter(args):
+        settings = get_settings(override_server=args.server, override_port=args.port)
+        get_console().print(f"{field.label}: {getattr(settings, field.attribute)}")
 
-    # Create directory if it doesn't exist
-    os.makedirs(config_dir, exist_ok=True)
+    getter.__doc__ = field.get_help + "."
+    return getter
 
-    # Load existing config or create a new one
-    config_data = {}
-    if config_file.exists():
-        try:
-            with open(config_file, "r") as f:
-                config_data = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
 
-    # Update config with new server port
-    config_data["server_port"] = args.port_value
-    config_data["api_url"] = settings.api_url
+for config_field in CONFIG_FIELDS:
+    command_functions[f"config_set-{config_field.command}"] = make_setter(config_field)
+for config_field in CONFIG_FIELDS:
+    command_functions[f"config_get-{config_field.command}"] = make_getter(config_field)
 
-    # Save config
-    with open(config_file, "w") as f:
-        json.dump(config_data, f, indent=2)
 
-    console.print(f"[green]Server port set to: {args.port_value}[/green]")
-    console.print(f"[green]API URL updated to: {settings.api_url}[/green]")
+def _build_config(subparsers, command=None):
+    """Add the configuration commands to the parser."""
+    config_parser = subparsers.add_parser("config", help=GROUP_HELP["config"])
+    config_subparsers = config_parser.add_subparsers(dest="config_command", help="Config command to execute")
+    config_subparsers.required = True
+    command = selected_command("config", command)
 
-command_functions["config_set-port"] = set_server_port
+    # Set commands
+    for field in CONFIG_FIELDS:
+        if command in (None, f"set-{field.command}"):
+            set_parser = config_subparsers.add_parser(f"set-{field.command}", help=field.set_help)
+            set_parser.add_argument(field.argument, type=field.argument_type, help=field.argument_help)
 
-# Get API URL command
-get_url_parser = config_subparsers.add_parser("get-url", help="Get the current API URL")
+    # Get commands
+    for field in CONFIG_FIELDS:
+        if command in (None, f"get-{field.command}"):
+            config_subparsers.add_parser(f"get-{field.command}", help=field.get_help)
 
-def get_api_url(args):
-    """Get the current API URL."""
-    settings = get_settings(override_server=args.server, override_port=args.port)
-    console.print(f"API URL: {settings.api_url}")
 
-command_functions["config_get-url"] = get_api_url
+# Command functions by group then by command, the group subparsers store the command in <group>_command
+DISPATCH: Dict[str, Dict[str, Callable]] = {}
+for command_key, command_function in command_functions.items():
+    command_group, command_name = command_key.split("_", 1)
+    DISPATCH.setdefault(command_group, {})[command_name] = command_function
 
-# Get server name command
-get_server_parser = config_subparsers.add_parser("get-server", help="Get the current server name")
 
-def get_server_name(args):
-    """Get the current server name."""
-    settings = get_settings(override_server=args.server, override_port=args.port)
-    console.print(f"Server name: {settings.server_name}")
+# Builders of the command groups, only called for the groups actually needed
+BUILDERS: Dict[str, Callable] = {
+    "auth": _build_auth,
+    "org": _build_org,
+    "config": _build_config,
+}
 
-command_functions["config_get-server"] = get_server_name
 
-# Get server port command
-get_port_parser = config_subparsers.add_parser("get-port", help="Get the current server port")
+def command_words(argv: List[str]) -> List[Optional[str]]:
+    """Return the command group and the command, skipping the global options and their values."""
+    words = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in value_options:
+            skip = True
+        elif not arg.startswith("-"):
+            words.append(arg)
+            if len(words) == 2:
+                break
+    return words + [None] * (2 - len(words))
 
-def get_server_port(args):
-    """Get the current server port."""
-    settings = get_settings(override_server=args.server, override_port=args.port)
-    console.print(f"Server port: {settings.server_port}")
 
-command_functions["config_get-port"] = get_server_port
+def print_main_help():
+    """Print the main help, with the command groups only: the parsers of their commands are not built."""
+    for group, help_text in GROUP_HELP.items():
+        subparsers.add_parser(group, help=help_text)
+    parser.print_help()
 
 
 def main():
     """Main entry point for the CLI."""
+    # Without a command, or when only the main help is requested, the command parsers are not needed
+    if len(sys.argv) == 1:
+        print_main_help()
+        sys.exit(1)
+    if len(sys.argv) == 2 and sys.argv[1] in ("-h", "--help"):
+        print_main_help()
+        sys.exit(0)
+
+    # Only build the subparser of the requested command, every group is needed for the global help
+    group, command = command_words(sys.argv[1:])
+    builder = BUILDERS.get(group)
+    if builder is not None:
+        builder(subparsers, command)
+    else:
+        for builder in BUILDERS.values():
+            builder(subparsers)
+
     args = parser.parse_args()
 
     # Determine the command to execute
-    if args.command == "auth":
-        command_key = f"auth_{args.auth_command}"
-    elif args.command == "org":
-        command_key = f"org_{args.org_command}"
-    elif args.command == "config":
-        command_key = f"config_{args.config_command}"
-    else:
+    group_functions = DISPATCH.get(args.command)
+    if group_functions is None:
         parser.print_help()
         sys.exit(1)
+    command = getattr(args, args.command + "_command")
 
     # Execute the command function
-    if command_key in command_functions:
-        command_functions[command_key](args)
+    command_function = group_functions.get(command)
+    if command_function is not None:
+        command_function(args)
     else:
-        console.print(f"[red]Unknown command: {command_key}[/red]")
+        get_console().print(f"[red]Unknown command: {args.command}_{command}[/red]")
         sys.exit(1)
 
 
@@ -11,28 +11,227 @@
 
 import sys
 import os
+from functools import cached_property, lru_cache, update_wrapper
+from types import FunctionType
 from pathlib import Path
 
 system = sys.platform
+_IS_WIN = system == "win32"
+_IS_MAC = system == "darwin"
 
 BASE_DIR = Path(__file__).parent.parent
 
 
 def _ensure_exists(path, mode=0o700):
-    if not os.path.exists(path):
-        head, tail = os.path.split(path)
-        _ensure_exists(head)
+    # Create first and only look at the parents when they are missing, an existing path costs one syscall
+    try:
         os.mkdir(path, mode)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        _ensure_exists(os.path.dirname(path))
+        try:
+            os.mkdir(path, mode)
+        except FileExistsError:
+            # created by another process meanwhile
+            pass
     return path
 
 
 class paths(object):
+    # __dict__ is only materialized once cached_property stores dirs in it
+    __slots__ = ('app_name', 'app_author', '__dict__')
+
     def __init__(self, app_name, app_author):
-        self.dirs = AppDirs(app_name, app_author)
         self.app_name = app_name
         self.app_author = app_author
 
+    @cached_property
+    def dirs(self):
+        return AppDirs(self.app_name, self.app_author)
+
+
+# ---- platform implementations, the one of the running platform is bound to each documented function
+
+def _sep_terminated(path):
+    # Roots are kept with their trailing separator so the application parts are simply appended,
+    # the filesystem root already ends with it
+    return path.rstrip(os.sep) + os.sep
+
+
+def _app_path(home, appname=None, version=None):
+    # home ends with the separator, without an appname it is returned without it
+    if not appname:
+        return home[:-1] or home
+    if version:
+        return home + appname + os.sep + version
+    return home + appname
+
+
+if _IS_WIN:
+    def _join_parts(path, *parts):
+        # Single str.join of the parts actually given, appauthor False and a missing version are skipped
+        return os.sep.join([path.rstrip(os.sep), *[part for part in parts if part]])
+
+    def _user_data_dir(appname=None, appauthor=None, version=None, roaming=False):
+        if appauthor is None:
+            appauthor = appname
+        const = "CSIDL_APPDATA" if roaming else "CSIDL_LOCAL_APPDATA"
+        path = _get_win_folder(const)
+        if appname:
+            path = _join_parts(path, appauthor, appname, version)
+        return path
+
+    def _site_data_dir(appname=None, appauthor=None, version=None, check_exists=True):
+        # The common application data folder is not used, site data lives in the application directory
+        return os.path.join("/app", appname, "data")
+
+    # Same folders as the data dir, bound once instead of forwarding each call
+    _user_config_dir = _user_data_dir
+
+    def _site_config_dir(appname=None, appauthor=None, version=None):
+        path = _site_data_dir(appname, appauthor)
+        if appname:
+            path = _join_parts(path, version)
+        return path
+
+    def _user_cache_dir(appname=None, appauthor=None, version=None, opinion=True):
+        if appauthor is None:
+            appauthor = appname
+        path = _get_win_folder("CSIDL_LOCAL_APPDATA")
+        if appname:
+            path = _join_parts(path, appauthor, appname, "Cache" if opinion else None, version)
+        return path
+
+    def _site_cache_dir(appname=None, appauthor=None, version=None):
+        if appname and version:
+            return _join_parts(_site_data_dir(appname, appauthor, version), "cache", version)
+        return _join_parts(_site_data_dir(appname, appauthor, version), "cache")
+
+    def _site_log_dir(appname=None, appauthor=None, version=None):
+        if appname and version:
+            return _join_parts(_site_data_dir(appname, appauthor, version), "log", version)
+        return _join_parts(_site_data_dir(appname, appauthor, version), "log")
+
+    # State too is kept with the data
+    _user_state_dir = _user_data_dir
+
+    def _user_log_dir(appname=None, appauthor=None, version=None, opinion=True):
+        if appauthor is None:
+            appauthor = appname
+        path = _get_win_folder("CSIDL_LOCAL_APPDATA")
+        if appname:
+            return _join_parts(path, appauthor, appname, version, "Logs" if opinion else None)
+        return _join_parts(path, "Logs" if opinion else None)
+
+elif _IS_MAC:
+    # User directories, expanded once since the home directory does not change
+    _USER_DATA_HOME = os.path.expanduser('~/Library/Application Support/')
+    _USER_CONFIG_HOME = os.path.expanduser('~/Library/Preferences/')
+    _USER_CACHE_HOME = os.path.expanduser('~/Library/Caches/')
+    _USER_LOG_HOME = os.path.expanduser('~/Library/Logs/')
+
+    # System directories, absolute so there is nothing to expand
+    _SITE_CONFIG_HOME = '/Library/Preferences/'
+    _SITE_CACHE_HOME = '/Library/Caches/'
+    _SITE_LOG_HOME = '/Library/Logs/'
+
+    def _user_data_dir(appname=None, appauthor=None, version=None, roaming=False):
+        return _app_path(_USER_DATA_HOME, appname, version)
+
+    def _site_data_dir(appname=None, appauthor=None, version=None, check_exists=True):
+        # /Library/Application Support is not used, site data lives in the application directory
+        return os.path.join("/app", appname, "data")
+
+    def _user_config_dir(appname=None, appauthor=None, version=None, roaming=False):
+        return _app_path(_USER_CONFIG_HOME, appname, version)
+
+    def _site_config_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_CONFIG_HOME, appname)
+
+    def _user_cache_dir(appname=None, appauthor=None, version=None, opinion=True):
+        return _app_path(_USER_CACHE_HOME, appname, version)
+
+    def _site_cache_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_CACHE_HOME, appname, version)
+
+    def _site_log_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_LOG_HOME, appname, version)
+
+    _user_state_dir = _user_data_dir
+
+    def _user_log_dir(appname=None, appauthor=None, version=None, opinion=True):
+        return _app_path(_USER_LOG_HOME, appname, version)
+
+else:
+    # XDG base directories, read once from the environment the process was started with
+    # an empty variable is treated as unset, as the XDG specification requires
+    _XDG_DATA_HOME = _sep_terminated(os.getenv('XDG_DATA_HOME') or os.path.expanduser("~/.local/share"))
+    _XDG_CONFIG_HOME = _sep_terminated(os.getenv('XDG_CONFIG_HOME') or os.path.expanduser("~/.config"))
+    _XDG_CACHE_HOME = _sep_terminated(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'))
+    _XDG_STATE_HOME = _sep_terminated(os.getenv('XDG_STATE_HOME') or os.path.expanduser("~/.local/state"))
+
+    # System directories, absolute so there is nothing to expand
+    _SITE_CONFIG_HOME = '/etc/'
+    _SITE_CACHE_HOME = '/var/cache/'
+    _SITE_LOG_HOME = '/var/log/'
+
+    def _user_data_dir(appname=None, appauthor=None, version=None, roaming=False):
+        return _app_path(_XDG_DATA_HOME, appname, version)
+
+    def _site_data_dir(appname=None, appauthor=None, version=None, check_exists=True):
+        # XDG default for $XDG_DATA_DIRS
+        # only first, if multipath is False
+        path = os.getenv('XDG_DATA_DIRS',
+                         os.pathsep.join(['/usr/local/share', '/usr/share']))
+        if appname and version:
+            appname = f"{appname}/{version}"
+
+        # Candidates are built one at a time, stopping at the first existing one
+        for base in path.split(os.pathsep):
+            path = os.path.expanduser(base.rstrip(os.sep))
+            if appname:
+                path = os.sep.join([path, appname])
+            if not check_exists or os.path.exists(path):
+                return path
+        return os.path.join("/app", appname, "data")
+
+    def _user_config_dir(appname=None, appauthor=None, version=None, roaming=False):
+        return _app_path(_XDG_CONFIG_HOME, appname, version)
+
+    def _site_config_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_CONFIG_HOME, appname)
+
+    def _user_cache_dir(appname=None, appauthor=None, version=None, opinion=True):
+        return _app_path(_XDG_CACHE_HOME, appname, version)
+
+    def _site_cache_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_CACHE_HOME, appname, version)
+
+    def _site_log_dir(appname=None, appauthor=None, version=None):
+        return _app_path(_SITE_LOG_HOME, appname, version)
+
+    def _user_state_dir(appname=None, appauthor=None, version=None, roaming=False):
+        return _app_path(_XDG_STATE_HOME, appname, version)
+
+    def _user_log_dir(appname=None, appauthor=None, version=None, opinion=True):
+        path = _user_cache_dir(appname, appauthor, version)
+        if opinion:
+            # the cache root alone may be the filesystem root, which already ends with the separator
+            path = path.rstrip(os.sep) + os.sep + "log"
+        return path
+
+
+def _platform_specific(function):
+    """Replace the documented function by its implementation for the running platform."""
+    implementation = globals()["_" + function.__name__]
+    # A copy sharing the code, so implementations bound under several names keep their own docstring
+    specific = FunctionType(implementation.__code__, implementation.__globals__, function.__name__,
+                            implementation.__defaults__, implementation.__closure__)
+    return update_wrapper(specific, function)
 
+
+@_platform_specific
 def user_data_dir(appname=None, appauthor=None, version=None, roaming=False):
     r"""Return full path to the user-specific data dir for this application.
 
@@ -65,30 +264,10 @@ def user_data_dir(appname=None, appauthor=None, version=None, roaming=False):
     For Unix, we follow the XDG spec and support $XDG_DATA_HOME.
     That means, by default "~/.local/share/<AppName>".
     """
-    if system == "win32":
-        if appauthor is None:
-            appauthor = appname
-        const = "CSIDL_APPDATA" if roaming else "CSIDL_LOCAL_APPDATA"
-        path = os.path.normpath(_get_win_folder(const))
-        if appname:
-            if appauthor is not False:
-                path = os.path.join(path, appauthor, appname)
-            else:
-                path = os.path.join(path, appname)
-    elif system == 'darwin':
-        path = os.path.expanduser('~/Library/Application Support/')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.getenv('XDG_DATA_HOME', os.path.expanduser("~/.local/share"))
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
-def site_data_dir(appname=None, appauthor=None, version=None):
+@_platform_specific
+def site_data_dir(appname=None, appauthor=None, version=None, check_exists=True):
     r"""Return full path to the user-shared data dir for this application.
 
         :param appname: is the name of application.
@@ -102,6 +281,9 @@ def site_data_dir(appname=None, appauthor=None, version=None):
             of your app to be able to run independently. If used, this
             would typically be "<major>.<minor>".
             Only applied when appname is present.
+        :param check_exists: (boolean, default True) can be False to return
+            the first $XDG_DATA_DIRS candidate on Unix without checking
+            that it exists, saving a stat per candidate.
 
     Typical site data directories are:
         Mac OS X:   /Library/Application Support/<AppName>
@@ -112,34 +294,6 @@ def site_data_dir(appname=None, appauthor=None, version=None):
 
     WARNING: Do not use this on Windows. See the Vista-Fail note above for why.
     """
-    if system == "win32":
-        if appauthor is None:
-            appauthor = appname
-        path = os.path.normpath(_get_win_folder("CSIDL_COMMON_APPDATA"))
-        if appname:
-            if appauthor is not False:
-                path = os.path.join(path, appauthor, appname)
-            else:
-                path = os.path.join(path, appname)
-    elif system == 'darwin':
-        path = os.path.expanduser('/Library/Application Support')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        # XDG default for $XDG_DATA_DIRS
-        # only first, if multipath is False
-        path = os.getenv('XDG_DATA_DIRS',
-                         os.pathsep.join(['/usr/local/share', '/usr/share']))
-        pathlist = [os.path.expanduser(x.rstrip(os.sep)) for x in path.split(os.pathsep)]
-        if appname:
-            if version:
-                appname = os.path.join(appname, version)
-            pathlist = [os.sep.join([x, appname]) for x in pathlist]
-
-        for path in pathlist:
-            if os.path.exists(path):
-                return path
-    return os.path.join("/app", appname, "data")
 
 
 def site_lib_dir(appname=None, appauthor=None, version=None):
@@ -162,6 +316,7 @@ def site_lib_dir(appname=None, appauthor=None, version=None):
     return  BASE_DIR
 
 
+@_platform_specific
 def user_config_dir(appname=None, appauthor=None, version=None, roaming=False):
     r"""Return full path to the user-specific config dir for this application.
 
@@ -191,21 +346,9 @@ def user_config_dir(appname=None, appauthor=None, version=None, roaming=False):
     For Unix, we follow the XDG spec and support $XDG_CONFIG_HOME.
     That means, by default "~/.config/<AppName>".
     """
-    if system == "win32":
-        path = user_data_dir(appname, appauthor, None, roaming)
-    elif system == 'darwin':
-        path = os.path.expanduser('~/Library/Preferences/')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.getenv('XDG_CONFIG_HOME', os.path.expanduser("~/.config"))
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
+@_platform_specific
 def site_config_dir(appname=None, appauthor=None, version=None):
     r"""Return full path to the user-shared data dir for this application.
 
@@ -231,21 +374,9 @@ def site_config_dir(appname=None, appauthor=None, version=None):
 
     WARNING: Do not use this on Windows. See the Vista-Fail note above for why.
     """
-    if system == 'win32':
-        path = site_data_dir(appname, appauthor)
-        if appname and version:
-            path = os.path.join(path, version)
-    elif system == 'darwin':
-        path = os.path.expanduser('/Library/Preferences')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.path.expanduser('/etc')
-        if appname:
-            path = os.path.join(path, appname)
-    return path
 
 
+@_platform_specific
 def user_cache_dir(appname=None, appauthor=None, version=None, opinion=True):
     r"""Return full path to the user-specific cache dir for this application.
 
@@ -277,30 +408,9 @@ def user_cache_dir(appname=None, appauthor=None, version=None, opinion=True):
         ...\Mozilla\Firefox\Profiles\<ProfileName>\Cache
         ...\Acme\SuperApp\Cache\1.0
     """
-    if system == "win32":
-        if appauthor is None:
-            appauthor = appname
-        path = os.path.normpath(_get_win_folder("CSIDL_LOCAL_APPDATA"))
-        if appname:
-            if appauthor is not False:
-                path = os.path.join(path, appauthor, appname)
-            else:
-                path = os.path.join(path, appname)
-            if opinion:
-                path = os.path.join(path, "Cache")
-    elif system == 'darwin':
-        path = os.path.expanduser('~/Library/Caches')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
+@_platform_specific
 def site_cache_dir(appname=None, appauthor=None, version=None):
     r"""
     The site_cache_dir function is intended to return a directory where the
@@ -337,22 +447,9 @@ def site_cache_dir(appname=None, appauthor=None, version=None):
     OPINION: This function appends "Cache" to the `CSIDL_LOCAL_APPDATA` value.
     This can be disabled with the `opinion=False` option.
     """
-    if system == "win32":
-        path = site_data_dir(appname, appauthor, version)
-        path = os.path.join(path, "cache")
-    elif system == 'darwin':
-        path = os.path.expanduser('/Library/Caches')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.path.expanduser("/var/cache")
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
+@_platform_specific
 def site_log_dir(appname=None, appauthor=None, version=None):
     r"""
     The site_log_dir function is intended to return a directory where the
@@ -389,21 +486,9 @@ def site_log_dir(appname=None, appauthor=None, version=None):
     OPINION: This function appends "Cache" to the `CSIDL_LOCAL_APPDATA` value.
     This can be disabled with the `opinion=False` option.
     """
-    if system == "win32":
-        path = site_data_dir(appname, appauthor, version)
-        path = os.path.join(path, "log")
-    elif system == 'darwin':
-        path = os.path.expanduser('/Library/Logs')
-        if appname:
-            path = os.path.join(path, appname)
-    else:
-        path = os.path.expanduser("/var/log")
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
+
+@_platform_specific
 def user_state_dir(appname=None, appauthor=None, version=None, roaming=False):
     r"""Return full path to the user-specific state dir for this application.
 
@@ -435,17 +520,9 @@ def user_state_dir(appname=None, appauthor=None, version=None, roaming=False):
 
     That means, by default "~/.local/state/<AppName>".
     """
-    if system in ["win32", "darwin"]:
-        path = user_data_dir(appname, appauthor, None, roaming)
-    else:
-        path = os.getenv('XDG_STATE_HOME', os.path.expanduser("~/.local/state"))
-        if appname:
-            path = os.path.join(path, appname)
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
+@_platform_specific
 def user_log_dir(appname=None, appauthor=None, version=None, opinion=True):
     r"""Return full path to the user-specific log dir for this application.
 
@@ -474,27 +551,13 @@ def user_log_dir(appname=None, appauthor=None, version=None, opinion=True):
     go in the `CSIDL_LOCAL_APPDATA` directory. (Note: I'm interested in
     examples of what some windows apps use for a logs dir.)
     """
-    if system == "darwin":
-        path = os.path.join(
-            os.path.expanduser('~/Library/Logs'),
-            appname)
-    elif system == "win32":
-        path = user_data_dir(appname, appauthor, version)
-        version = False
-        if opinion:
-            path = os.path.join(path, "Logs")
-    else:
-        path = user_cache_dir(appname, appauthor, version)
-        version = False
-        if opinion:
-            path = os.path.join(path, "log")
-    if appname and version:
-        path = os.path.join(path, version)
-    return path
 
 
 class AppDirs(object):
-    """Convenience wrapper for getting application dirs."""
+    """Convenience wrapper for getting application dirs, each dir is computed on first access."""
+
+    # The settings are slots, __dict__ is left for the dirs cached_property stores on first access
+    __slots__ = ('appname', 'appauthor', 'version', 'roaming', '__dict__')
 
     def __init__(self, appname=None, appauthor=None, version=None, roaming=False):
         self.appname = appname
@@ -502,52 +565,52 @@ class AppDirs(object):
         self.version = version
         self.roaming = roaming
 
-    @property
+    @cached_property
     def user_data_dir(self):
         return user_data_dir(self.appname, self.appauthor,
                              version=self.version, roaming=self.roaming)
 
-    @property
+    @cached_property
     def site_data_dir(self):
         return site_data_dir(self.appname, self.appauthor,
                              version=self.version)
 
-    @property
+    @cached_property
     def site_lib_dir(self):
         return site_lib_dir(self.appname, self.appauthor,
                              version=self.version)
 
-    @property
+    @cached_property
     def user_config_dir(self):
         return user_config_dir(self.appname, self.appauthor,
                                version=self.version, roaming=self.roaming)
 
-    @property
+    @cached_property
     def site_config_dir(self):
         return site_config_dir(self.appname, self.appauthor,
                                version=self.version)
 
-    @property
+    @cached_property
     def user_cache_dir(self):
         return user_cache_dir(self.appname, self.appauthor,
                               version=self.version)
 
-    @property
+    @cached_property
     def site_cache_dir(self):
         return site_cache_dir(self.appname, self.appauthor,
                               version=self.version)
 
-    @property
+    @cached_property
     def user_state_dir(self):
         return user_state_dir(self.appname, self.appauthor,
                               version=self.version)
 
-    @property
+    @cached_property
     def user_log_dir(self):
         return user_log_dir(self.appname, self.appauthor,
                             version=self.version)
 
-    @property
+    @cached_property
     def site_log_dir(self):
         return site_log_dir(self.appname, self.appauthor,
                             version=self.version)
@@ -555,6 +618,25 @@ class AppDirs(object):
 
 # ---- internal support stuff
 
+_CSIDL_SHELL_FOLDER_NAMES = {
+    "CSIDL_APPDATA": "AppData",
+    "CSIDL_COMMON_APPDATA": "Common AppData",
+    "CSIDL_LOCAL_APPDATA": "Local AppData",
+}
+
+_CSIDL_CONSTS = {
+    "CSIDL_APPDATA": 26,
+    "CSIDL_COMMON_APPDATA": 35,
+    "CSIDL_LOCAL_APPDATA": 28,
+}
+
+_CSIDL_ENV_VARS = {
+    "CSIDL_APPDATA": "APPDATA",
+    "CSIDL_COMMON_APPDATA": "ALLUSERSPROFILE",
+    "CSIDL_LOCAL_APPDATA": "LOCALAPPDATA",
+}
+
+
 def _get_win_folder_from_registry(csidl_name):
     """This is a fallback technique at best. I'm not sure if using the
     registry for this guarantees us the correct answer for all CSIDL_*
@@ -562,11 +644,7 @@ def _get_win_folder_from_registry(csidl_name):
     """
     import winreg as _winreg
 
-    shell_folder_name = {
-        "CSIDL_APPDATA": "AppData",
-        "CSIDL_COMMON_APPDATA": "Common AppData",
-        "CSIDL_LOCAL_APPDATA": "Local AppData",
-    }[csidl_name]
+    shell_folder_name = _CSIDL_SHELL_FOLDER_NAMES[csidl_name]
 
     key = _winreg.OpenKey(
         _winreg.HKEY_CURRENT_USER,
@@ -579,49 +657,50 @@ def _get_win_folder_from_registry(csidl_name):
 def _get_win_folder_with_ctypes(csidl_name):
     import ctypes
 
-    csidl_const = {
-        "CSIDL_APPDATA": 26,
-        "CSIDL_COMMON_APPDATA": 35,
-        "CSIDL_LOCAL_APPDATA": 28,
-    }[csidl_name]
+    csidl_const = _CSIDL_CONSTS[csidl_name]
 
     buf = ctypes.create_unicode_buffer(1024)
     ctypes.windll.shell32.SHGetFolderPathW(None, csidl_const, None, 0, buf)
 
     # Downgrade to short path name if have highbit chars. See
     # <http://bugs.activestate.com/show_bug.cgi?id=85099>.
-    has_high_char = False
-    for c in buf:
-        if ord(c) > 255:
-            has_high_char = True
-            break
-    if has_high_char:
+    # Only the characters before the terminating NUL are looked at, isascii() settles the
+    # common case in one pass and max() keeps latin-1 paths as they are.
+    value = buf.value
+    if not value.isascii() and max(value) > '\xff':
         buf2 = ctypes.create_unicode_buffer(1024)
-        if ctypes.windll.kernel32.GetShortPathNameW(buf.value, buf2, 1024):
-            buf = buf2
+        if ctypes.windll.kernel32.GetShortPathNameW(value, buf2, 1024):
+            value = buf2.value
 
-    return buf.value
+    return value
 
 
 def _get_win_folder_from_environ(csidl_name):
-    env_var_name = {
-        "CSIDL_APPDATA": "APPDATA",
-        "CSIDL_COMMON_APPDATA": "ALLUSERSPROFILE",
-        "CSIDL_LOCAL_APPDATA": "LOCALAPPDATA",
-    }[csidl_name]
+    env_var_name = _CSIDL_ENV_VARS[csidl_name]
 
     return os.environ[env_var_name]
 
 
-if system == "win32":
+def _get_win_folder_environ_first(csidl_name):
+    """The environment variables are set on every supported Windows version,
+    the shell or the registry is only asked when one of them is missing.
+    The folder is normalized here, once, rather than by every caller.
+    """
+    return os.path.normpath(os.environ.get(_CSIDL_ENV_VARS[csidl_name]) or _get_win_folder_fallback(csidl_name))
+
+
+if _IS_WIN:
     try:
         from ctypes import windll
     except ImportError:
         try:
             import winreg as _winreg
         except ImportError:
-            _get_win_folder = _get_win_folder_from_environ
+            _get_win_folder_fallback = _get_win_folder_from_environ
         else:
-            _get_win_folder = _get_win_folder_from_registry
+            _get_win_folder_fallback = _get_win_folder_from_registry
     else:
-        _get_win_folder = _get_win_folder_with_ctypes
+        _get_win_folder_fallback = _get_win_folder_with_ctypes
+
+    # The known folders do not move while the process runs, each one is looked up once
+    _get_win_folder = lru_cache(maxsize=None)(_get_win_folder_environ_first)
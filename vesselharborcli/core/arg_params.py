@@ -12,6 +12,54 @@ import argparse
 import textwrap
 
 
+class dedent_help_formatter(argparse.RawDescriptionHelpFormatter):
+    """Raw description formatter removing the common indentation, only when help is rendered."""
+
+    def _fill_text(self, text, width, indent):
+        return super()._fill_text(textwrap.dedent(text), width, indent)
+
+
+class lazy_subparsers_action(argparse._SubParsersAction):
+    """
+    Sub parsers action only building the parser of the command group actually selected.
+
+    Command groups are listed in the choices and in the help as soon as they are added,
+    their parser is created and filled by the instance `params` method when argparse
+    dispatches to it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy = {}
+
+    def add_lazy_parser(self, name, instance):
+        """
+        Register the command group of an instance without building its parser.
+
+        :param name: The tuple returned by the instance `subparser` method.
+        :type name: tuple
+
+        :param instance: The instance whose `params` method fills the parser.
+        :type instance: object
+        """
+        self._lazy[name[0]] = (name, instance)
+        # A placeholder keeps the name among the accepted choices until it is built
+        self._name_parser_map[name[0]] = None
+        self._choices_actions.append(self._ChoicesPseudoAction(name[0], (), name[1]))
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        lazy = self._lazy.pop(values[0], None)
+        if lazy is not None:
+            name, instance = lazy
+            del self._name_parser_map[name[0]]
+            if len(name) > 2 and name[2] is not None:
+                sub = self.add_parser(name[0], formatter_class=dedent_help_formatter, epilog=name[2])
+            else:
+                sub = self.add_parser(name[0])
+            instance.params(sub)
+        super().__call__(parser, namespace, values, option_string)
+
+
 class arg_parser():
     def __init__(self, program, version, description, basic_options, instances_desc = None, instances = None, generic= True):
         """
@@ -55,20 +103,16 @@ class arg_parser():
                 desc[key] = value
         if generic == True:
             if instances is not None and len(instances) > 0:
-                subparsers = self.parser.add_subparsers( title = desc['title'], description =desc['description'], help = desc['help'], dest = desc['dest'])
+                subparsers = self.parser.add_subparsers( title = desc['title'], description =desc['description'], help = desc['help'], dest = desc['dest'], action = lazy_subparsers_action)
+                # Only the selected command group gets its parser built, see lazy_subparsers_action
                 for instance in instances:
-                    name = instance.subparser()
-                    if len(name) > 2 and name[2] is not None:
-                        sub = subparsers.add_parser(name[0], help = name[1],formatter_class=argparse.RawDescriptionHelpFormatter, epilog=textwrap.dedent(name[2]))
-                    else:
-                        sub = subparsers.add_parser(name[0], help=name[1])
-                    instance.params(sub)
+                    subparsers.add_lazy_parser(instance.subparser(), instance)
         else:
             if instances is not None and len(instances) > 0:
                 instances[0].params(self.parser)
 
 
-    def parse_args(self,args):
+    def parse_args(self,args, *, skip=1):
         """
         Summarizes the process to parse arguments using a parser and returns the parsed result.
 
@@ -80,6 +124,10 @@ class arg_parser():
                      to be the script name and will be ignored during parsing.
         :type args: List[str]
 
+        :param skip: Number of leading elements of `args` to ignore, 0 when the caller
+                     already removed the script name.
+        :type skip: int
+
         :return: An object representing the parsed arguments.
         :rtype: argparse.Namespace
 
@@ -88,10 +136,10 @@ class arg_parser():
             or a similar compatible parser.
 
         """
-        res = self.parser.parse_args(args[1:])
+        res = self.parser.parse_args(args[skip:] if skip else args)
         return res
 
-    def parse_known_args(self,args):
+    def parse_known_args(self,args, *, skip=1):
         """
         A class responsible for parsing command-line arguments.
 
@@ -104,7 +152,7 @@ class arg_parser():
         :type parser: argparse.ArgumentParser
 
         """
-        res = self.parser.parse_known_args(args[1:])
+        res = self.parser.parse_known_args(args[skip:] if skip else args)
         return res
 
     def print_help(self):
@@ -11,25 +11,33 @@
 #
 #
 
-import json
 import os
+import tempfile
 import time
-from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
-from http.cookies import SimpleCookie
+from typing import Dict
 
-import requests
-from pydantic import BaseModel
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
-from vesselharborcli.core.config import get_config, get_base_url
+from vesselharborcli.core.config import get_config, get_base_url, get_credentials
 
+_session = None
+
+def get_session():
+    """Get the HTTP session shared by all API calls, keeping connections alive between them."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
 
-class TokenResponse(BaseModel):
-    """Token response model."""
-    access_token: str
-    token_type: str
-    expires_in: Optional[int] = None
-    refresh_token: Optional[str] = None
 
 class AuthenticationError(Exception):
     """Authentication error."""
@@ -37,172 +45,210 @@ class AuthenticationError(Exception):
 
 class TokenManager:
     """Token manager for handling authentication tokens."""
+    __slots__ = ("config", "credentials", "base_url", "login_url", "refresh_url", "me_url", "cache_file",
+                 "access_token", "refresh_token", "expires_at", "_user_info")
+
     def __init__(self):
+        self.config = get_config()
+        self.credentials = get_credentials()
+        self.base_url = get_base_url()
+        self.login_url = f"{self.base_url}/login"
+        self.refresh_url = f"{self.base_url}/refresh-token"
+        self.me_url = f"{self.base_url}/me"
+        # Tokens are kept between runs in the data directory, next to the other cached files
+        self.cache_file = os.path.join(self.config.path.DATA_DIR, "tokens.json")
         self.access_token = None
         self.refresh_token = None
+        self.expires_at = None
         self._user_info = None
 
-    def login_with_password(self) -> bool:
-        """Login with configured username and password."""
-        config = get_config()
-        url = f"{get_base_url()}/login"
-        data = {
-            "username": config['application.user'],
-            "password": config['application.password'],
-            "grant_type": "password",
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    @property
+    def session(self):
+        """HTTP session to use for requests."""
+        return get_session()
 
+    def _cache_owner(self) -> Dict[str, str]:
+        """Identify the server and the credentials the cached tokens were obtained with.
+
+        The credentials are those ensure_authentication logs in with, only a hash of them is kept.
+        """
+        import hashlib
+
+        credentials = self.credentials
+        if credentials.user and credentials.password:
+            used = f"password\0{credentials.user}\0{credentials.password}"
+        elif credentials.api_key:
+            used = f"api_key\0{credentials.api_key}"
+        else:
+            used = ""
+        digest = hashlib.sha256(f"{self.base_url}\0{used}".encode()).hexdigest()
+        return {"server": self.base_url, "user": credentials.user, "credentials": digest}
+
+    def _load_cache(self) -> bool:
+        """Take the tokens saved by a previous run for the same server and account.
+
+        Returns:
+            bool: True if tokens were loaded from the cache file.
+        """
         try:
-            response = requests.post(url, data=data, headers=headers)
-            response.raise_for_status()
-            token_data = response.json()
-            if token_data['status'] == 'success':
-                set_cookie = response.headers.get('set-cookie')
-                if not set_cookie:
-                    return False
-                cookie_parts = set_cookie.split(', ')
-                cookie_strings = []
-                current = ""
-                for part in cookie_parts:
-                    if '=' in part and part.split('=')[0].strip() in ('access_token', 'refresh_token'):
-                        if current:
-                            cookie_strings.append(current)
-                        current = part
-                    else:
-                        current += ', ' + part
-                if current:
-                    cookie_strings.append(current)
-                tokens = {}
-                for raw_cookie in cookie_strings:
-                    cookie = SimpleCookie()
-                    cookie.load(raw_cookie)
-                    for key in cookie:
-                        tokens[key] = cookie[key].value
-                self.access_token = tokens['access_token'] if 'access_token' in tokens else None
-                self.refresh_token = tokens['refresh_token'] if 'refresh_token' in tokens else None
-                return self.access_token is not None and self.refresh_token is not None
+            with open(self.cache_file, "rb") as cache:
+                cached = json_loads(cache.read())
+            if cached.get("owner") != self._cache_owner():
+                # Tokens of another server or account are of no use any more
+                self._drop_cache()
+                return False
+            self.access_token = cached.get("access_token")
+            self.refresh_token = cached.get("refresh_token")
+            self.expires_at = cached.get("expires_at")
+            return True
+        except (OSError, ValueError, AttributeError):
             return False
-        except requests.HTTPError as e:
-            raise AuthenticationError(f"Password auth failed: {e.response.text}")
-        except requests.RequestException as e:
-            raise AuthenticationError(f"Request failed: {str(e)}")
 
-    def login_with_api_key(self) -> bool:
-        """Login with configured API key."""
-        config = get_config()
-        url = f"{get_base_url()}/login"
-        headers = {"Authorization": f"Bearer {config['application.api_key']}"}
+    def _save_cache(self):
+        """Save the current tokens for the next runs, readable by the user only."""
+        import json
 
+        cached = {
+            "owner": self._cache_owner(),
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at,
+        }
+        temporary = None
         try:
-            response = requests.post(url, headers=headers)
+            # A new file only readable by the user, never an existing file or link
+            fd, temporary = tempfile.mkstemp(dir=os.path.dirname(self.cache_file), prefix="tokens.",
+                                             suffix=".tmp")
+            with os.fdopen(fd, "w") as cache:
+                json.dump(cached, cache)
+            os.replace(temporary, self.cache_file)
+        except OSError:
+            # The cache only saves a login, failing to write it is not an error
+            if temporary is not None and os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _drop_cache(self):
+        """Remove the saved tokens."""
+        try:
+            os.remove(self.cache_file)
+        except OSError:
+            pass
+
+    def is_expired(self) -> bool:
+        """Check whether the access token is known to be expired, or about to be."""
+        return self.expires_at is not None and time.time() > self.expires_at - 30
+
+    def _do_login(self, url: str, failure: str, *, data=None, headers=None, renew_refresh=True) -> bool:
+        """Post to a token endpoint and keep the tokens it sets in cookies.
+
+        Args:
+            url: Token endpoint to post to.
+            failure: Start of the error message when the server rejects the request.
+            data: Form data to post, if any.
+            headers: Headers of the request.
+            renew_refresh: Also take the refresh token from the response. When False the
+                request is made with the refresh token, which is dropped if rejected.
+
+        Returns:
+            bool: True if the server accepted the request and set the token cookies.
+        """
+        import requests
+
+        try:
+            response = self.session.post(url, data=data, headers=headers)
             response.raise_for_status()
-            token_data = response.json()
-            if token_data['status'] == 'success':
-                set_cookie = response.headers.get('set-cookie')
-                if not set_cookie:
-                    return False
-                cookie_parts = set_cookie.split(', ')
-                cookie_strings = []
-                current = ""
-                for part in cookie_parts:
-                    if '=' in part and part.split('=')[0].strip() in ('access_token', 'refresh_token'):
-                        if current:
-                            cookie_strings.append(current)
-                        current = part
-                    else:
-                        current += ', ' + part
-                if current:
-                    cookie_strings.append(current)
-                tokens = {}
-                for raw_cookie in cookie_strings:
-                    cookie = SimpleCookie()
-                    cookie.load(raw_cookie)
-                    for key in cookie:
-                        tokens[key] = cookie[key].value
-                self.access_token = tokens['access_token'] if 'access_token' in tokens else None
-                self.refresh_token = tokens['refresh_token'] if 'refresh_token' in tokens else None
-                return True
-            return False
+            token_data = json_loads(response.content)
+            if token_data.get('status') != 'success':
+                return False
+            # The cookie jar of the response already parsed the Set-Cookie headers, Max-Age and
+            # Expires being turned into an expiration timestamp
+            tokens = {cookie.name: cookie for cookie in response.cookies}
+            if not tokens:
+                return False
+            access = tokens.get('access_token')
+            self.access_token = access.value if access is not None else None
+            self.expires_at = access.expires if access is not None else None
+            if renew_refresh:
+                self.refresh_token = tokens['refresh_token'].value if 'refresh_token' in tokens else None
+            self._save_cache()
+            return True
         except requests.HTTPError as e:
-            raise AuthenticationError(f"API key auth failed: {e.response.text}")
+            if not renew_refresh:
+                self.access_token = None
+                self.refresh_token = None
+            raise AuthenticationError(f"{failure}: {e.response.text}")
         except requests.RequestException as e:
             raise AuthenticationError(f"Request failed: {str(e)}")
+        except ValueError as e:
+            raise AuthenticationError(f"Invalid response: {str(e)}")
 
-    def refresh(self) -> TokenResponse:
+    def login_with_password(self) -> bool:
+        """Login with configured username and password."""
+        data = {
+            "username": self.credentials.user,
+            "password": self.credentials.password,
+            "grant_type": "password",
+        }
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        return (self._do_login(self.login_url, "Password auth failed", data=data, headers=headers)
+                and self.access_token is not None and self.refresh_token is not None)
+
+    def login_with_api_key(self) -> bool:
+        """Login with configured API key."""
+        headers = {"Authorization": f"Bearer {self.credentials.api_key}"}
+        return self._do_login(self.login_url, "API key auth failed", headers=headers)
+
+    def refresh(self) -> bool:
         """Refresh the access token using the refresh token."""
         if not self.refresh_token:
             return False
 
         self.access_token = None
-        url = f"{get_base_url()}/refresh-token"
         headers = {"Authorization": f"Bearer {self.refresh_token}"}
-
-        try:
-            response = requests.post(url, headers=headers)
-            response.raise_for_status()
-            token_data = response.json()
-            if token_data['status'] == 'success':
-                set_cookie = response.headers.get('set-cookie')
-                if not set_cookie:
-                    return False
-                cookie_parts = set_cookie.split(', ')
-                cookie_strings = []
-                current = ""
-                for part in cookie_parts:
-                    if '=' in part and part.split('=')[0].strip() in ('access_token', 'refresh_token'):
-                        if current:
-                            cookie_strings.append(current)
-                        current = part
-                    else:
-                        current += ', ' + part
-                if current:
-                    cookie_strings.append(current)
-                tokens = {}
-                for raw_cookie in cookie_strings:
-                    cookie = SimpleCookie()
-                    cookie.load(raw_cookie)
-                    for key in cookie:
-                        tokens[key] = cookie[key].value
-                self.access_token = tokens['access_token'] if 'access_token' in tokens else None
-                return True
-            return False
-        except requests.HTTPError as e:
-            self.token = None
-            self.refresh_token = None
-            raise AuthenticationError(f"Token refresh failed: {e.response.text}")
-        except requests.RequestException as e:
-            raise AuthenticationError(f"Request failed: {str(e)}")
+        return self._do_login(self.refresh_url, "Token refresh failed", headers=headers, renew_refresh=False)
 
     def get_auth_header(self) -> Dict[str, str]:
         """Get the authorization header for API requests."""
-        config = get_config()
         if self.access_token:
             return {"Authorization": f"Bearer {self.access_token}"}
         else:
             raise AuthenticationError("No authentication token or API key available")
 
     def ensure_authentication(self):
-        """Ensure valid authentication credentials exist."""
+        """Ensure valid authentication credentials exist.
 
-        if self.access_token and self.refresh_token:
+        The access token in memory is used while it is valid, then it is renewed with the
+        refresh token and only when this is not possible a new login is done. Tokens of a
+        previous run are reused the same way.
+        """
+        if self.access_token is None and self.refresh_token is None:
+            self._load_cache()
+        if self.access_token and not self.is_expired():
             return True
-        config = get_config()
-        if config['application.user'] and config['application.password']:
+        if self.refresh_token:
+            try:
+                if self.refresh():
+                    return True
+            except AuthenticationError:
+                pass
+        if self.credentials.user and self.credentials.password:
             # Attempt to login with password
             return self.login_with_password()
-        if config.config['application.api_key']:
-            # Attempt to login with password
+        if self.credentials.api_key:
+            # Attempt to login with API key
             return self.login_with_api_key()
         return False
 
     def refresh_authentication(self):
-        """Ensure valid authentication credentials."""
-        config = get_config()
-        if self.refresh_token():
-            return True
-        else:
-            return self.ensure_authentication()
+        """Renew the access token with the refresh token, only logging in again when this fails."""
+        # The current access token is not used any more, even when there is nothing to refresh it with
+        self.access_token = None
+        try:
+            if self.refresh():
+                return True
+        except AuthenticationError:
+            pass
+        return self.ensure_authentication()
 
     def get_user_info(self, force_refresh=False):
         """Get information about the current user from the /me endpoint.
@@ -220,14 +266,13 @@ class TokenManager:
             return None
 
         try:
-            import requests
-            url = f"{get_base_url()}/me"
+            url = self.me_url
             headers = self.get_auth_header()
 
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             response.raise_for_status()
 
-            data = response.json()
+            data = json_loads(response.content)
             if data.get('status') == 'success' and 'data' in data:
                 self._user_info = data['data']
                 return self._user_info
@@ -247,3 +292,13 @@ class TokenManager:
         if user_info is None:
             return False
         return user_info.get('is_superadmin', False)
+
+
+_token_manager = None
+
+def get_token_manager():
+    """Get the token manager shared by the API clients, so that authentication happens once per run."""
+    global _token_manager
+    if _token_manager is None:
+        _token_manager = TokenManager()
+    return _token_manager
@@ -11,8 +11,16 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
+_CAMEL2SNAKE_DIGIT_RE = re.compile(r"([a-zA-Z])([0-9])")
+_CAMEL2SNAKE_UPPER_RE = re.compile(r"([a-z0-9])([A-Z])")
+_SNAKE2CAMEL_RE = re.compile(r"([0-9A-Za-z])_(?=[0-9A-Z])")
+_SNAKE2CAMEL_START_RE = re.compile(r"^_*[A-Z]")
 
+
+# Names come from a small set of API fields, each conversion is computed once
+@lru_cache(maxsize=4096)
 def snake2camel(snake: str, start_lower: bool = False) -> str:
     """
     Convert a snake_case string to camelCase.
@@ -32,12 +40,13 @@ def snake2camel(snake: str, start_lower: bool = False) -> str:
 
     """
     camel = snake.title()
-    camel = re.sub("([0-9A-Za-z])_(?=[0-9A-Z])", lambda m: m.group(1), camel)
+    camel = _SNAKE2CAMEL_RE.sub(r"\1", camel)
     if start_lower:
-        camel = re.sub("(^_*[A-Z])", lambda m: m.group(1).lower(), camel)
+        camel = _SNAKE2CAMEL_START_RE.sub(lambda m: m.group(0).lower(), camel)
     return camel
 
 
+@lru_cache(maxsize=4096)
 def camel2snake(camel: str) -> str:
     """
     Convert a string from CamelCase to snake_case
@@ -51,6 +60,6 @@ def camel2snake(camel: str) -> str:
 
     :return: The converted string in snake_case format.
     :rtype: str"""
-    snake = re.sub(r"([a-zA-Z])([0-9])", lambda m: f"{m.group(1)}_{m.group(2)}", camel)
-    snake = re.sub(r"([a-z0-9])([A-Z])", lambda m: f"{m.group(1)}_{m.group(2)}", snake)
+    snake = _CAMEL2SNAKE_DIGIT_RE.sub(r"\1_\2", camel)
+    snake = _CAMEL2SNAKE_UPPER_RE.sub(r"\1_\2", snake)
     return snake.lower()
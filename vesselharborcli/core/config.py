@@ -10,11 +10,23 @@
 
 import os
 import sys
-
-from .settings import EnumSettings, AppSettings
+from functools import lru_cache
+from types import SimpleNamespace
 
 _config = {}
+_base_url = None
+_credentials = None
+
 
+def __getattr__(name):
+    # The settings module is only imported once a configuration is created or its classes are used
+    if name in ('EnumSettings', 'AppSettings'):
+        from . import settings
+        return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Privileges do not change while the process runs, they are probed once
+@lru_cache(maxsize=1)
 def has_system():
     """
     **Summary:**
@@ -44,11 +56,19 @@ def has_system():
         else:
             return (user,False)
 
-def get_base_url():
+def make_base_url(config):
     """Construct base URL from configuration."""
-    if _config['application.socket']:
-        return f"http://unix:{_config['application.socket']}"
-    return f"http://{_config['application.ip_address']}:{_config['application.port']}"
+    if config['application.socket']:
+        return f"http://unix:{config['application.socket']}"
+    return f"http://{config['application.ip_address']}:{config['application.port']}"
+
+def get_base_url():
+    """Get the base URL of the configuration created by create_config."""
+    return _base_url
+
+def get_credentials():
+    """Get the user, password and api_key of the configuration created by create_config, as attributes."""
+    return _credentials
 
 def create_config(conf_file, args, params_link, default_config, devel = False):
     """
@@ -76,6 +96,8 @@ def create_config(conf_file, args, params_link, default_config, devel = False):
     :return: An AppSettings instance configured for the current environment and parameters.
     :rtype: AppSettings
     """
+    from .settings import EnumSettings, AppSettings
+
     if devel == True:
         env = EnumSettings.Debug
     elif  os.path.exists("/.dockerenv"):
@@ -87,8 +109,13 @@ def create_config(conf_file, args, params_link, default_config, devel = False):
         else:
             env = EnumSettings.User
 
-    global _config
+    global _config, _base_url, _credentials
     _config = AppSettings(env, conf_file, args, default_config, params_link)
+    # The server address and the credentials do not change once the configuration is read
+    _base_url = make_base_url(_config)
+    _credentials = SimpleNamespace(user=_config['application.user'],
+                                   password=_config['application.password'],
+                                   api_key=_config['application.api_key'])
     return _config
 
 def get_config():
@@ -10,7 +10,9 @@
 
 import json
 import os
+import tempfile
 from copy import copy
+from functools import cached_property
 from pathlib import Path
 
 import tomllib
@@ -18,6 +20,45 @@ import tomli_w
 
 from .type_conv import to_type
 
+# types of the settings values that to_type returns unchanged when they already have the type of the default
+_KEPT_TYPES = frozenset((bool, int, float, str))
+
+
+def compile_schema(ref):
+    """
+    Compile the structure of a default configuration section.
+
+    The schema of a section is a tuple ``(template, entries)``: *template* tells the section is a
+    template section (``<>``) and *entries* is a tuple of ``(section, settings, schema)`` where
+    *schema* is the schema of *settings* when it is itself a section, None for a setting. For a
+    template section, the single entry is the one of ``<>``.
+
+    :param ref: The default configuration section.
+    :type ref: dict
+    :return: The schema of the section.
+    :rtype: tuple
+    """
+    template = len(ref) == 1 and "<>" in ref
+    return (template, tuple((section, settings, compile_schema(settings) if isinstance(settings, dict) else None)
+                            for section, settings in ref.items()))
+
+
+def _convert(settings, value):
+    """
+    Convert a setting value to the type of its default value.
+
+    A value already of the exact type of a bool, int, float or str default is returned as is,
+    to_type would return it unchanged.
+
+    :param settings: The default value of the setting.
+    :param value: The value to convert.
+    :return: The converted value.
+    """
+    if type(value) is type(settings) and type(settings) in _KEPT_TYPES:
+        return value
+    return to_type(settings, value)
+
+
 class config_file():
 
     def __init__(self, default_config, file_name = "none"):
@@ -30,6 +71,8 @@ class config_file():
         * if a parameter is defined as <>, it's considered as a template parameter. It's convenient if for example you have to configure
         several items with the same structure. for example: account definitions, remote servers definitions ...
         Conformity of each element (section, setting, subsetting and type) is compared with the default configuration. If not compatible, the value is rejected silently
+        The file is parsed here but its values are only converted when first used (see config): a value that can not be
+        converted to the type of its default raises at that point, not in __init__.
         TODO: No version management of the configuration file implemented so far.
 
 
@@ -46,7 +89,11 @@ class config_file():
         """
 
         self.default_config = default_config
-        self.config = None
+        # path -> node of the path in default_config, filled by ref_node
+        self._ref_nodes = {}
+        # path -> default value of the path, filled by get_default
+        self._defaults = {}
+        self._config = None
         if file_name != "none":
             self.confDir = Path(file_name).parent
             self.confFile = file_name
@@ -54,36 +101,74 @@ class config_file():
             self.confDir = None
             self.confFile = None
 
-        if self.confFile is not None and os.path.isfile(self.confFile):
-            with open(self.confFile, "rb") as f:
-                readconfig = tomllib.load(f)
-            self.new = False
-        else:
-            readconfig = {}
-            self.new = True
-        # normalize configuration
-        # or create a new config structure based on default_config structure
+        self._read_config = {}
+        self.new = True
+        if self.confFile is not None:
+            try:
+                with open(self.confFile, "rb") as f:
+                    self._read_config = tomllib.load(f)
+                self.new = False
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                pass
+        # the parsed document is kept until the configuration is normalized against default_config
+        # on first use (see config)
+
+    def _read_elem(self, elem_list):
+        """
+        Get an element of the parsed configuration file, before normalization.
 
-        def get_elem(elem_list):
-            if readconfig is None:
-                return None
-            cur_conf= None
-            cur_subconf = readconfig
-            for elem in elem_list:
-                cur_conf = cur_subconf
-                cur_subconf = cur_conf.get(elem)
-                if cur_subconf is None:
-                    # elem is not present in the configuration
-                    return None
-            if cur_conf is None:
+        :param elem_list: The sections and setting to follow.
+        :type elem_list: list[str] or tuple
+        :return: The element, None when it is not present.
+        """
+        if self._read_config is None:
+            return None
+        cur_conf= None
+        cur_subconf = self._read_config
+        for elem in elem_list:
+            cur_conf = cur_subconf
+            cur_subconf = cur_conf.get(elem)
+            if cur_subconf is None:
+                # elem is not present in the configuration
                 return None
-            return cur_subconf
+        if cur_conf is None:
+            return None
+        return cur_subconf
 
-        self.override(get_elem)
+    @cached_property
+    def schema(self):
+        """
+        The schema of the default configuration, compiled once for the instance (see compile_schema).
+        """
+        return compile_schema(self.default_config)
+
+    @property
+    def config(self):
+        """
+        The normalized configuration.
+
+        The configuration read from the file is normalized against the default configuration
+        the first time it is needed: settings read with get_config are converted straight from
+        the file, as level_treat would convert them, so a configuration file only used as a source
+        of settings is never normalized. Conversion errors are raised when the value is first used.
+
+        :return: The configuration dictionary.
+        :rtype: dict
+        """
+        if self._config is None:
+            self._config = config_file.level_treat(None, self.default_config, self._read_elem, [], False,
+                                                   self.schema)
+            self._read_config = None
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+        self._read_config = None
 
 
     @staticmethod
-    def level_treat(old_config, ref_config, item_getter, options, with_internal):
+    def level_treat(old_config, ref_config, item_getter, options, with_internal, schema=None):
         """
         Treats the old configuration based on reference configuration.
 
@@ -108,43 +193,50 @@ class config_file():
                               be included in processing.
         :type with_internal: bool
 
+        :param schema: The schema of the reference configuration, compiled from it when not given.
+        :type schema: tuple or None
+
         :return: New configuration dictionary after treatment.
         :rtype: dict
         """
-        new_config = {}
-        genericEnv = False
-        if "<>" in ref_config and len(ref_config) == 1:
-            ref_section = set([] if old_config is None else old_config.keys())
-            item_dict = item_getter(options)
-            ref_section = list(ref_section | set([] if item_dict is None else item_dict.keys()))
-            genericEnv = True
-        else:
-            ref_section = ref_config.keys()
-        for section in ref_section:
-            if old_config is not None and section in old_config:
-                config_section = old_config[section]
-            else:
-                config_section = None
-
-            if genericEnv:
-                settings = ref_config["<>"]
-            else:
-                settings = ref_config[section]
+        root_config = {}
+        if schema is None:
+            schema = compile_schema(ref_config)
+        pending = [(old_config, schema, options, root_config)]
+        # (parent, section, new section) of each section created, parents before their subsections
+        created = []
+        while pending:
+            old_config, (template, entries), options, new_config = pending.pop()
+            if template:
+                ref_section = set([] if old_config is None else old_config.keys())
+                item_dict = item_getter(options)
+                ref_section = list(ref_section | set([] if item_dict is None else item_dict.keys()))
+                _, settings, schema = entries[0]
+                entries = [(section, settings, schema) for section in ref_section]
+            for section, settings, schema in entries:
+                if not with_internal and section == 'internal':
+                    continue
+                if old_config is not None and section in old_config:
+                    config_section = old_config[section]
+                else:
+                    config_section = None
 
-            if not isinstance(settings, dict):
-                if with_internal or section != 'internal':
+                if schema is None:
                     val = item_getter(options + [section])
                     if val is None:
                         if config_section is not None:
-                            new_config[section] = to_type(settings, config_section)
+                            new_config[section] = _convert(settings, config_section)
                     else:
-                        new_config[section] =  to_type(settings, val)
-            else:
-                if with_internal or section != 'internal':
-                    results = config_file.level_treat(config_section, settings, item_getter, options + [section], with_internal)
-                    if len(results) != 0:
-                        new_config[section] = results
-        return new_config
+                        new_config[section] = _convert(settings, val)
+                else:
+                    results = new_config[section] = {}
+                    created.append((new_config, section, results))
+                    pending.append((config_section, schema, options + [section], results))
+        # drop the empty sections, subsections first
+        for new_config, section, results in reversed(created):
+            if len(results) == 0:
+                del new_config[section]
+        return root_config
 
     def override(self, item_getter=None, with_internal=False):
         """
@@ -159,37 +251,51 @@ class config_file():
         """
 
         #replace with the new configuration calculated
-        self.config = config_file.level_treat(self.config, self.default_config, item_getter, [], with_internal)
+        self.config = config_file.level_treat(self.config, self.default_config, item_getter, [], with_internal,
+                                              self.schema)
 
-    @staticmethod
-    def __get_elem_generic(ref, config, options):
+    def ref_node(self, path):
+        """
+        Get the node of the default configuration describing a path, checking each element is defined.
+
+        Template sections (``<>``) accept any name. The result is cached with the instance: the default
+        configuration is not modified once given to a config_file.
+
+        :param path: The sections and settings to follow.
+        :type path: tuple
+        :raises ConfigException: If an element of the path is not defined.
+        :return: The default configuration node (section or default value) of the path.
+        """
+        node = self._ref_nodes.get(path)
+        if node is not None:
+            return node
+        node = self.default_config
+        for index, elem in enumerate(path):
+            ref_section = "<>" if len(node) == 1 and "<>" in node else elem
+            if ref_section not in node:
+                raise ConfigException(list(path[:index + 1]))
+            node = node[ref_section]
+        self._ref_nodes[path] = node
+        return node
+
+    def __get_elem_generic(self, config, options):
         """
-        The __get_elem_generic function is a recursive function that takes three arguments:
-        ref, config, and options. The ref argument is the reference to the configuration data.
+        The __get_elem_generic function takes two arguments: config and options.
         The config argument is a dictionary of dictionaries containing all of the sections in
         the configuration file with their respective keys and values. The options argument is
-        a list of dictionary keys.
+        a list of dictionary keys, checked against the default configuration.
 
-        :param ref: Store the configuration template
         :param config: Store the configuration data
         :param options: Specify the section and subsection of the config file that is being searched
         :return: A value from the configuration file
         """
-        cur_ref = ref
         cur_config = config
-        treated = []
-        for elem in options:
-            treated.append(elem)
-            if len(cur_ref) == 1 and "<>" in cur_ref:
-                ref_section = "<>"
-            else:
-                ref_section =elem
-            if ref_section not in cur_ref:
-                raise ConfigException(treated)
+        for index, elem in enumerate(options):
             if elem not in cur_config:
+                self.ref_node(options[:index + 1])
                 return None
-            cur_ref = cur_ref[ref_section]
             cur_config = cur_config[elem]
+        self.ref_node(options)
         return cur_config
 
     def get_default(self, *args):
@@ -203,7 +309,10 @@ class config_file():
         :param *args: Pass a variable number of arguments to a function
         :return: The default value for a setting of a section
         """
-        return copy(config_file.__get_elem_generic(self.default_config, self.default_config, args))
+        if args in self._defaults:
+            return copy(self._defaults[args])
+        value = self._defaults[args] = self.__get_elem_generic(self.default_config, args)
+        return copy(value)
 
     def get_config(self, *args):
         """
@@ -217,7 +326,22 @@ class config_file():
         """
         if len(args) == 1 and isinstance(args[0], list):
             args = tuple(args[0])
-        return config_file.__get_elem_generic(self.default_config, self.config, args)
+        if self._config is None and args:
+            # not normalized yet: a setting is converted straight from the configuration read
+            try:
+                settings = self.ref_node(args)
+            except (ConfigException, TypeError):
+                # how an undefined path is reported depends on the normalized configuration
+                settings = {}
+            if not isinstance(settings, dict):
+                # the leaf step of level_treat, without internal sections as in the normalization
+                if 'internal' in args:
+                    return None
+                val = self._read_elem(args)
+                if val is None:
+                    return None
+                return _convert(settings, val)
+        return self.__get_elem_generic(self.config, args)
 
     def get(self, *args):
         """
@@ -243,21 +367,12 @@ class config_file():
         :return: The value written
         """
 
-        cur_ref = self.default_config
+        self.ref_node(args)
         cur_config = self.config
         old_config = None
-        treated = []
         for elem in args:
-            treated.append(elem)
-            if len(cur_ref) == 1 and "<>" in cur_ref:
-                ref_section = "<>"
-            else:
-                ref_section =elem
-            if ref_section not in cur_ref:
-                raise ConfigException(treated)
             if elem not in cur_config:
                 cur_config[elem] = {}
-            cur_ref = cur_ref[ref_section]
             old_config = cur_config
             cur_config = cur_config[elem]
         if old_config is not None:
@@ -285,21 +400,13 @@ class config_file():
         :return: True if the setting is defined, false otherwise
         """
 
-        cur_ref = self.default_config
         cur_config = self.config
-        treated = []
-        for elem in args:
-            treated.append(elem)
-            if len(cur_ref) == 1 and "<>" in cur_ref:
-                ref_section = "<>"
-            else:
-                ref_section =elem
-            if ref_section not in cur_ref:
-                raise ConfigException(treated)
+        for index, elem in enumerate(args):
             if elem not in cur_config:
+                self.ref_node(args[:index + 1])
                 return False
-            cur_ref = cur_ref[ref_section]
             cur_config = cur_config[elem]
+        self.ref_node(args)
         return True
 
     def delete(self, *args):
@@ -324,23 +431,15 @@ class config_file():
             success = config.delete("my_section", "my_setting")
         """
 
-        cur_ref = self.default_config
         cur_config = self.config
-        treated = []
         old_config = None
-        for elem in args:
-            treated.append(elem)
-            if len(cur_ref) == 1 and "<>" in cur_ref:
-                ref_section = "<>"
-            else:
-                ref_section =elem
-            if ref_section not in cur_ref:
-                raise ConfigException(treated)
+        for index, elem in enumerate(args):
             if elem not in cur_config:
+                self.ref_node(args[:index + 1])
                 return False
-            cur_ref = cur_ref[ref_section]
             old_config = cur_config
             cur_config = cur_config[elem]
+        self.ref_node(args)
         if old_config is not None:
             del old_config[elem]
             return True
@@ -351,30 +450,37 @@ class config_file():
         Filter internal configuration.
 
         This method is responsible for removing any 'internal' keys from a
-        configuration dictionary. It uses recursion to traverse through all nested
-        dictionaries and remove the specified key if found.
+        configuration dictionary. It walks all nested dictionaries with an explicit
+        stack, copying them without the 'internal' keys and the sections left empty.
 
         :return:
             A new configuration object with 'internal' keys removed.
         """
 
-        def filter_internal_recur(value):
-            new_config = {}
-            for section, value in value.items():
+        root_config = {}
+        pending = [(self.config, root_config)]
+        # (parent, section, new section) of each section created, parents before their subsections
+        created = []
+        while pending:
+            config, new_config = pending.pop()
+            for section, value in config.items():
+                if section == 'internal':
+                    continue
                 if not isinstance(value, dict):
-                    if section != 'internal':
-                        new_config[section] = value
+                    new_config[section] = value
                 else:
-                    if section != 'internal':
-                        results =  filter_internal_recur(value)
-                        if len(results) != 0:
-                            new_config[section] = results
-            return new_config
+                    results = new_config[section] = {}
+                    created.append((new_config, section, results))
+                    pending.append((value, results))
+        # drop the empty sections, subsections first
+        for new_config, section, results in reversed(created):
+            if len(results) == 0:
+                del new_config[section]
 
         newconf= config_file(self.default_config)
         newconf.confDir = self.confDir
         newconf.confFile = self.confFile
-        newconf.config = filter_internal_recur(self.config)
+        newconf.config = root_config
         return newconf
 
     def write(self) -> None:
@@ -393,8 +499,8 @@ class config_file():
             """
         if self.confDir is None:
             return
-        if self.confDir != '' and not os.path.exists(self.confDir):
-            os.makedirs(self.confDir)
+        if self.confDir != '':
+            os.makedirs(self.confDir, exist_ok=True)
         return self.writeto(self.confFile)
 
     def writeto(self, filename: str) -> None:
@@ -404,7 +510,10 @@ class config_file():
 
             This method serializes the configuration object and writes it
             to a specified file. If the file does not exist, it will be created.
-            If the file already exists, its contents will be overwritten.
+            If the file already exists, its contents will be replaced once the
+            new contents are completely written, keeping its permissions. A new
+            file is only readable by the user as it holds credentials. When the
+            file is a symbolic link, the file it points to is replaced.
 
             :param filename: The name of the file to write the configuration to.
             :type filename: str
@@ -413,9 +522,22 @@ class config_file():
 
             :return: None
             """
-        serialized = tomli_w.dumps(self.config)
-        with open(filename, 'wb') as confFileid:
-            confFileid.write(serialized)
+        target = os.path.realpath(filename)
+        # created next to the target, readable by the user only
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(target), prefix=os.path.basename(target) + ".",
+                                         suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as confFileid:
+                tomli_w.dump(self.config, confFileid)
+            try:
+                os.chmod(temporary, os.stat(target).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, target)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
 
     def enumerate(self, *args):
         """
@@ -438,19 +560,7 @@ class config_file():
                   configuration dictionary.
 
         """
-        cur_ref = self.default_config
-        treated= []
-        for elem in args:
-            treated.append(elem)
-            if len(cur_ref) == 1 and "<>" in cur_ref:
-                ref_section = "<>"
-            else:
-                ref_section =elem
-            if ref_section not in cur_ref:
-                raise ConfigException(treated)
-            cur_ref = cur_ref[ref_section]
-
-        for read_item in cur_ref.keys():
+        for read_item in self.ref_node(args).keys():
             yield read_item
 
     def json(self, **kwargs):
@@ -9,7 +9,7 @@
 #
 #
 
-from .config import get_base_url, get_config
+from .config import get_config
 
 import requests
 
@@ -51,40 +51,33 @@ def authenticated_request( token_manager,
     **kwargs
 ) -> requests.Response:
     """Make an authenticated request with automatic token refresh."""
+    # caller headers are taken once, they are sent with the first attempt and the retry
+    extra_headers = kwargs.pop('headers', None)
     try:
         if not token_manager.ensure_authentication():
             raise AuthenticationError("Invalid authentication credentials")
-        url = f"{get_base_url()}{endpoint}"
+        url = f"{token_manager.base_url}{endpoint}"
         headers = token_manager.get_auth_header()
-
-        if 'headers' in kwargs:
-            headers.update(kwargs['headers'])
-            del kwargs['headers']
+        if extra_headers:
+            headers.update(extra_headers)
 
         # First attempt
-        response = requests.request(method, url, headers=headers, **kwargs)
+        response = token_manager.session.request(method, url, headers=headers, **kwargs)
         response.raise_for_status()
         return response
     except requests.HTTPError as e:
         # Handle token expiration
-        if e.response.status_code == 401:
-            #try:
-            if True:
-
-                token_manager.refresh()
-                # Retry with new token
-                headers = token_manager.get_auth_header()
-                if 'headers' in kwargs:
-                    headers.update(kwargs['headers'])
-                    del kwargs['headers']
-
-                response = requests.request(method, url, headers=headers, **kwargs)
-                response.raise_for_status()
-                return response
-            #except Exception:
-            #    raise AuthenticationError("Authentication failed after refresh")
-        else:
+        if e.response.status_code != 401:
             raise
+        # The token was rejected before its known expiry, renew it
+        token_manager.refresh_authentication()
+        # Retry with new token
+        headers = token_manager.get_auth_header()
+        if extra_headers:
+            headers.update(extra_headers)
+
+        response = token_manager.session.request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
     except Exception as e:
-        print (e)
-        raise AuthenticationError(f"Request failed: {str(e)}")
+        raise AuthenticationError(f"Request failed: {str(e)}") from e
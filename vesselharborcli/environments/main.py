@@ -99,12 +99,8 @@ class environments_services(svc_class):
         delete_parser.set_defaults(func='delete_environment')
 
     @staticmethod
-    def test_name(name):
-        return name == __software__ + 'environment'
-
-    @staticmethod
-    def cmd_name(name):
-        return name == 'environment'
+    def prog_name():
+        return __software__ + 'environment'
 
     def run(self):
         config = get_config()
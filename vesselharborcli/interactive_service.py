@@ -38,12 +38,8 @@ class interactive_services(svc_class):
         parser.set_defaults(func='run_interactive')
 
     @staticmethod
-    def test_name(name):
-        return name == __software__ + 'interactive'
-
-    @staticmethod
-    def cmd_name(name):
-        return name == 'interactive'
+    def prog_name():
+        return __software__ + 'interactive'
 
     def run(self):
         config = get_config()
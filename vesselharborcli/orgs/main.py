@@ -87,12 +87,8 @@ class orgs_services(svc_class):
         delete_parser.set_defaults(func='delete_organization')
 
     @staticmethod
-    def test_name(name):
-        return name == __software__ + 'org'
-
-    @staticmethod
-    def cmd_name(name):
-        return name == 'org'
+    def prog_name():
+        return __software__ + 'org'
 
     def run(self):
         config = get_config()
@@ -103,10 +99,13 @@ class orgs_services(svc_class):
 
         try:
             if args.command == 'list':
-                orgs = api.list_organizations()
-                print(f"Organizations ({len(orgs)}):")
-                for org in orgs:
+                # Rows are printed as the pages arrive, the count is only known at the end
+                print("Organizations:")
+                count = 0
+                for org in api.iter_organizations():
                     print(f"  {org.id}: {org.name}")
+                    count += 1
+                print(f"Total: {count}")
 
             elif args.command == 'get':
                 org = api.get_organization(args.org_id)
@@ -1,10 +1,10 @@
 """API client for the VesselHarbor API."""
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 
 from pydantic import BaseModel
 
-from ..core.auth import TokenManager
+from ..core.auth import get_token_manager
 from ..core.config import get_base_url
 from ..core.requests import make_request
 
@@ -25,9 +25,9 @@ class OrganizationCreate(BaseModel):
 
 
 class OrganizationUpdate(BaseModel):
-    """Organization update model."""
+    """Organization update model, unset fields are left unchanged."""
 
-    name: str
+    name: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -46,12 +46,17 @@ class APIOrganization:
     def __init__(self, config):
         """Initialize with full configuration."""
         self.config = config
-        self.token_manager = TokenManager()
+        self.token_manager = get_token_manager()
         self.base_url = get_base_url()
 
-    def list_organizations(self, skip: int = 0, limit: int = 100) -> List[Organization]:
-        """List organizations."""
-        response = make_request(self.token_manager,"GET", "/organizations")
+    def list_organizations(self, skip: int = 0, limit: Optional[int] = None) -> List[Organization]:
+        """List organizations, all of them unless a page is requested with limit."""
+        params = None
+        if limit is not None:
+            params = {"skip": skip, "limit": limit}
+        elif skip:
+            params = {"skip": skip}
+        response = make_request(self.token_manager,"GET", "/organizations", params=params)
         data = response.json()
 
         if isinstance(data, dict) and "data" in data:
@@ -59,6 +64,22 @@ class APIOrganization:
 
         return [Organization(**org) for org in organizations]
 
+    def iter_organizations(self, page_size: int = 100) -> Iterator[Organization]:
+        """Iterate over all the organizations, requesting them one page at a time."""
+        skip = 0
+        previous = None
+        while True:
+            # One row more than the page tells whether another page follows, without an extra request
+            organizations = self.list_organizations(skip=skip, limit=page_size + 1)
+            # A server ignoring skip sends the same page again, stop instead of looping on it
+            if not organizations or organizations[0].id == previous:
+                return
+            yield from organizations[:page_size]
+            if len(organizations) <= page_size:
+                return
+            previous = organizations[0].id
+            skip += page_size
+
     def get_organization(self, org_id: int) -> Organization:
         """Get organization details."""
         response = make_request(self.token_manager,"GET", f"/organizations/{org_id}")
@@ -1,7 +1,4 @@
 
-from .core.config_file import config_file
-
-
 class svc_class:
 
     params_link = {}
@@ -16,8 +13,14 @@ class svc_class:
         pass
 
     @staticmethod
-    def test_name(name):
-        return False
+    def prog_name():
+        return None
+
+    def test_name(self, name):
+        return name == self.prog_name()
+
+    def cmd_name(self, name):
+        return name == self.subparser()[0]
 
     @staticmethod
     def params(parser):
@@ -61,18 +64,26 @@ class svc_store:
     def __init__(self, svc_list=None):
         if svc_list is None:
             svc_list = []
-        self.svcs = svc_list
+        self.svcs = []
+        self.prog_names = {}
+        self.cmd_names = {}
+        for svc in svc_list:
+            self.add_svc(svc)
 
     def add_svc(self, svc):
         self.svcs.append(svc)
+        if svc.prog_name() is not None:
+            self.prog_names[svc.prog_name()] = svc
+        if svc.subparser() is not None:
+            self.cmd_names[svc.subparser()[0]] = svc
 
     def selected_app(self, app_name):
-        # detect app kind based on program name prefix
-        selected_svc = None
-        for app in self.svcs:
-            if app.test_name(app_name):
-                selected_svc = app
-        return selected_svc
+        # detect app kind based on program name
+        return self.prog_names.get(app_name)
+
+    def selected_cmd(self, cmd_name):
+        # detect app kind based on command group name
+        return self.cmd_names.get(cmd_name)
 
     def update_params_link(self,params_link):
         for svc in self.svcs:
@@ -113,12 +113,8 @@ class users_services(svc_class):
         password_parser.set_defaults(func='change_password')
 
     @staticmethod
-    def test_name(name):
-        return name == __software__ + 'user'
-
-    @staticmethod
-    def cmd_name(name):
-        return name == 'user'
+    def prog_name():
+        return __software__ + 'user'
 
     def run(self):
         config = get_config()
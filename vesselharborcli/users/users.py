@@ -15,7 +15,7 @@ from typing import Dict, List, Optional, Any, Union
 
 from pydantic import BaseModel
 
-from ..core.auth import TokenManager
+from ..core.auth import get_token_manager
 from ..core.config import get_base_url
 from ..core.requests import make_request
 
@@ -73,7 +73,7 @@ class APIUser:
     def __init__(self, config):
         """Initialize with full configuration."""
         self.config = config
-        self.token_manager = TokenManager()
+        self.token_manager = get_token_manager()
         self.base_url = get_base_url()
 
     def list_users(self, skip: int = 0, limit: int = 100, email: Optional[str] = None) -> List[User]: